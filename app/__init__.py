@@ -3,12 +3,37 @@ from app.extensions import db, migrate
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
 from config import Config
+from app.utils.json_provider import ORJSONProvider
 
 
+def configure_engine_options(app):
+    """
+    Size the connection pool and ping connections on checkout
+
+    Pre-ping drops connections the server closed while idle instead of failing
+    the request that checks them out; LIFO checkout keeps the idle tail small
+    enough for pool_recycle to retire. SQLite keeps Flask-SQLAlchemy's defaults,
+    since its in-memory StaticPool rejects sizing arguments.
+    """
+    if app.config['SQLALCHEMY_DATABASE_URI'].startswith('sqlite'):
+        return
+    
+    options = {
+        'pool_size': app.config.get('DB_POOL_SIZE', 10),
+        'max_overflow': app.config.get('DB_MAX_OVERFLOW', 20),
+        'pool_recycle': app.config.get('DB_POOL_RECYCLE', 1800),
+        'pool_pre_ping': True,
+        'pool_use_lifo': True
+    }
+    options.update(app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {}))
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+
 
 def create_app(config_class=Config):
     app = Flask(__name__)
     app.config.from_object(config_class)
+    app.json = ORJSONProvider(app)
+    configure_engine_options(app)
 
     # Initialize extensions
     db.init_app(app)
@@ -17,6 +42,10 @@ def create_app(config_class=Config):
     
     # Initialize JWT
     jwt = JWTManager(app)
+    
+    # Reuse connections to Stripe across requests
+    from app.services.payment import configure_stripe_client
+    configure_stripe_client(app.config)
 
     # Register Blueprints
     from app.api import api_bp
@@ -38,5 +67,9 @@ def create_app(config_class=Config):
     # Register CLI commands
     from app.db_init.cli import register_commands
     register_commands(app)
+    
+    # Keep cached dashboard data in step with writes
+    from app.utils.cache import register_cache_invalidation
+    register_cache_invalidation()
 
     return app
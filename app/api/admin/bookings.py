@@ -8,7 +8,7 @@ from app.models import (
     Booking, Passenger, Payment
 )
 from app.models.enums import (
-    BookingStatus
+    BookingStatus, PaymentStatus
 )
 from app.extensions import db
 from app.utils.decorators import admin_required
@@ -318,7 +318,7 @@ def get_flight_booking_details(booking_reference):
         airline_fare_paid = False
         
         # Calculate total paid from approved payments
-        total_paid = sum([p.amount for p in booking.payments if p.status.name == 'PAID'])
+        total_paid = sum([p.amount for p in booking.payments if p.status is PaymentStatus.PAID])
         
         # Heuristic: Service fee is paid if total_paid >= service_fee
         if total_paid >= booking.service_fee and booking.service_fee > 0:
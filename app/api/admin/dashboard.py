@@ -16,6 +16,11 @@ from app.utils.api_response import APIResponse
 
 # ===== DASHBOARD OVERVIEW =====
 
+def _count(column, *criteria):
+    """SELECT COUNT(column) with optional criteria, skipping the ORM entity query"""
+    return db.session.query(func.count(column)).filter(*criteria).scalar()
+
+
 @admin_bp.route('/dashboard', methods=['GET'])
 @admin_required()
 def get_admin_dashboard():
@@ -35,16 +40,16 @@ def get_admin_dashboard():
         month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
         
         # User statistics
-        total_users = User.query.count()
-        new_users_month = User.query.filter(User.created_at >= month_start).count()
+        total_users = _count(User.id)
+        new_users_month = _count(User.id, User.created_at >= month_start)
         users_by_role = db.session.query(
             User.role, func.count(User.id)
         ).group_by(User.role).all()
         
         # Booking statistics
-        total_bookings = Booking.query.count()
-        confirmed_bookings = Booking.query.filter_by(status=BookingStatus.CONFIRMED).count()
-        pending_bookings = Booking.query.filter_by(status=BookingStatus.PENDING).count()
+        total_bookings = _count(Booking.id)
+        confirmed_bookings = _count(Booking.id, Booking.status == BookingStatus.CONFIRMED)
+        pending_bookings = _count(Booking.id, Booking.status == BookingStatus.PENDING)
         
         # Revenue calculation
         total_revenue = db.session.query(
@@ -61,14 +66,14 @@ def get_admin_dashboard():
         ).scalar() or 0
         
         # Quote statistics
-        pending_quotes = Quote.query.filter_by(status='pending').count()
-        total_quotes = Quote.query.count()
+        pending_quotes = _count(Quote.id, Quote.status == 'pending')
+        total_quotes = _count(Quote.id)
         
         # Package statistics
-        active_packages = Package.query.filter_by(is_active=True).count()
+        active_packages = _count(Package.id, Package.is_active == True)
         
         # Contact messages
-        unread_contacts = ContactMessage.query.filter_by(status='new').count()
+        unread_contacts = _count(ContactMessage.id, ContactMessage.status == 'new')
         
         # Recent activity - last 10 bookings
         recent_bookings = Booking.query.order_by(desc(Booking.created_at)).limit(10).all()
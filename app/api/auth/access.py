@@ -90,7 +90,7 @@ def login():
         
         access_token = create_access_token(
             identity=user.id,
-            additional_claims={'email': user.email, 'role': user.role.value},
+            additional_claims=user.get_token_claims(),
             expires_delta=timedelta(minutes=15)
         )
         refresh_token = create_refresh_token(
@@ -248,7 +248,7 @@ def google_oauth():
         # Generate JWT tokens
         access_token = create_access_token(
             identity=user.id,
-            additional_claims={'email': user.email, 'role': user.role.value}
+            additional_claims=user.get_token_claims()
         )
         refresh_token = create_refresh_token(identity=user.id)
         
@@ -312,7 +312,7 @@ def refresh():
         # Generate new access token
         new_access_token = create_access_token(
             identity=user.id,
-            additional_claims={'email': user.email, 'role': user.role.value}
+            additional_claims=user.get_token_claims()
         )
         
         return APIResponse.success(
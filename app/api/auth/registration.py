@@ -133,7 +133,7 @@ def register():
         # Generate JWT tokens
         access_token = create_access_token(
             identity=user.id,
-            additional_claims={'email': user.email, 'role': user.role.value}
+            additional_claims=user.get_token_claims()
         )
         refresh_token = create_refresh_token(identity=user.id)
         
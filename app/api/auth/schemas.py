@@ -3,20 +3,53 @@ Authentication validation schemas
 Provides comprehensive validation for all authentication endpoints
 """
 import re
+from functools import lru_cache
 from typing import Optional, Dict, Any, Tuple
 from datetime import datetime
 
 
+# Precompiled patterns shared by the validators below
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+_PHONE_FORMATTING_RE = re.compile(r'[\s\-\(\)]')
+_ASCII_DIGITS = b'0123456789'
+
+
+@lru_cache(maxsize=4096)
+def _normalize_email_cached(raw: str) -> str:
+    return raw.strip().lower()
+
+
+@lru_cache(maxsize=4096)
+def _normalize_code_cached(raw: str) -> str:
+    return raw.strip().upper()
+
+
+def _normalize_email(raw: str) -> str:
+    """Canonical (stripped, lowercased) form of an email, cached per raw input"""
+    if not raw:
+        return ''
+    return _normalize_email_cached(raw)
+
+
+def _normalize_code(raw: str) -> str:
+    """Canonical (stripped, uppercased) form of a referral code, cached per raw input"""
+    if not raw:
+        return ''
+    return _normalize_code_cached(raw)
+
+
 class AuthSchemas:
     """Validation schemas for authentication endpoints"""
     
     @staticmethod
-    def validate_registration(data: Dict[str, Any]) -> Tuple[bool, Optional[Dict[str, str]], Optional[Dict[str, Any]]]:
+    def validate_registration(data: Dict[str, Any], fail_fast: bool = True) -> Tuple[bool, Optional[Dict[str, str]], Optional[Dict[str, Any]]]:
         """
         Validate user registration data
         
         Args:
             data: Dictionary containing registration data
+            fail_fast: Stop at the first invalid field instead of collecting
+                errors for every field
             
         Returns:
             Tuple of (is_valid, errors, cleaned_data)
@@ -25,61 +58,43 @@ class AuthSchemas:
         cleaned_data = {}
         
         # Full name validation and splitting
-        first_name = data.get('first_name', '').strip()
-        last_name = data.get('last_name', '').strip()
+        first_name, last_name = AuthSchemas._split_full_name(data)
         if not first_name:
             errors['first_name'] = 'Full name is required'
         if not last_name:
             errors['last_name'] = 'Full name must be at least 2 characters'
-        
-        
+        if fail_fast and errors:
+            return AuthSchemas._result(errors, cleaned_data)
         
         cleaned_data['first_name'] = first_name
         cleaned_data['last_name'] = last_name
     
         # Email validation
-        email = data.get('email', '').strip().lower()
-        if not email:
-            errors['email'] = 'Email is required'
-        elif not AuthSchemas._validate_email_format(email):
-            errors['email'] = 'Invalid email format'
-        else:
-            cleaned_data['email'] = email
+        AuthSchemas._check_email(data, errors, cleaned_data)
+        if fail_fast and errors:
+            return AuthSchemas._result(errors, cleaned_data)
         
-        # Password validation
-        password = data.get('password', '')
-        confirm_password = data.get('confirmPassword', '')
-        
-        if not password:
-            errors['password'] = 'Password is required'
-        elif len(password) < 8:
-            errors['password'] = 'Password must be at least 8 characters'
-        elif not AuthSchemas._validate_password_strength(password):
-            errors['password'] = 'Password must contain at least one letter and one number'
-        else:
-            cleaned_data['password'] = password
-        
-        # Password confirmation
-        if not confirm_password:
-            errors['confirmPassword'] = 'Password confirmation is required'
-        elif password != confirm_password:
-            errors['confirmPassword'] = 'Passwords do not match'
+        # Password validation and confirmation
+        AuthSchemas._check_new_password(data, errors, cleaned_data)
+        if fail_fast and errors:
+            return AuthSchemas._result(errors, cleaned_data)
         
         # Optional phone validation
         phone = data.get('phone', '').strip()
         if phone:
             if not AuthSchemas._validate_phone(phone):
                 errors['phone'] = 'Invalid phone number format'
+                if fail_fast:
+                    return AuthSchemas._result(errors, cleaned_data)
             else:
                 cleaned_data['phone'] = phone
         
         # Optional referral code
-        referral_code = data.get('referralCode', '').strip().upper()
+        referral_code = _normalize_code(data.get('referralCode', ''))
         if referral_code:
             cleaned_data['referral_code'] = referral_code
         
-        is_valid = len(errors) == 0
-        return is_valid, errors if not is_valid else None, cleaned_data if is_valid else None
+        return AuthSchemas._result(errors, cleaned_data)
     
     @staticmethod
     def validate_login(data: Dict[str, Any]) -> Tuple[bool, Optional[Dict[str, str]], Optional[Dict[str, Any]]]:
@@ -96,13 +111,7 @@ class AuthSchemas:
         cleaned_data = {}
         
         # Email validation
-        email = data.get('email', '').strip().lower()
-        if not email:
-            errors['email'] = 'Email is required'
-        elif not AuthSchemas._validate_email_format(email):
-            errors['email'] = 'Invalid email format'
-        else:
-            cleaned_data['email'] = email
+        AuthSchemas._check_email(data, errors, cleaned_data)
         
         # Password validation
         password = data.get('password', '')
@@ -115,8 +124,7 @@ class AuthSchemas:
         remember_me = data.get('rememberMe', False)
         cleaned_data['remember_me'] = bool(remember_me)
         
-        is_valid = len(errors) == 0
-        return is_valid, errors if not is_valid else None, cleaned_data if is_valid else None
+        return AuthSchemas._result(errors, cleaned_data)
     
     @staticmethod
     def validate_google_oauth(data: Dict[str, Any]) -> Tuple[bool, Optional[Dict[str, str]], Optional[Dict[str, Any]]]:
@@ -136,16 +144,18 @@ class AuthSchemas:
         id_token = data.get('idToken', '').strip()
         if not id_token:
             errors['idToken'] = 'Google ID token is required'
+        elif id_token.count('.') != 2 or len(id_token) < 100:
+            # Cheap JWT shape check; signature verification happens in the OAuth handler
+            errors['idToken'] = 'Malformed Google ID token'
         else:
             cleaned_data['id_token'] = id_token
         
         # Optional referral code for new users
-        referral_code = data.get('referralCode', '').strip().upper()
+        referral_code = _normalize_code(data.get('referralCode', ''))
         if referral_code:
             cleaned_data['referral_code'] = referral_code
         
-        is_valid = len(errors) == 0
-        return is_valid, errors if not is_valid else None, cleaned_data if is_valid else None
+        return AuthSchemas._result(errors, cleaned_data)
     
     @staticmethod
     def validate_password_reset_request(data: Dict[str, Any]) -> Tuple[bool, Optional[Dict[str, str]], Optional[Dict[str, Any]]]:
@@ -162,16 +172,9 @@ class AuthSchemas:
         cleaned_data = {}
         
         # Email validation
-        email = data.get('email', '').strip().lower()
-        if not email:
-            errors['email'] = 'Email is required'
-        elif not AuthSchemas._validate_email_format(email):
-            errors['email'] = 'Invalid email format'
-        else:
-            cleaned_data['email'] = email
+        AuthSchemas._check_email(data, errors, cleaned_data)
         
-        is_valid = len(errors) == 0
-        return is_valid, errors if not is_valid else None, cleaned_data if is_valid else None
+        return AuthSchemas._result(errors, cleaned_data)
     
     @staticmethod
     def validate_password_reset_confirm(data: Dict[str, Any]) -> Tuple[bool, Optional[Dict[str, str]], Optional[Dict[str, Any]]]:
@@ -194,27 +197,10 @@ class AuthSchemas:
         else:
             cleaned_data['token'] = token
         
-        # New password validation
-        password = data.get('password', '')
-        confirm_password = data.get('confirmPassword', '')
+        # New password validation and confirmation
+        AuthSchemas._check_new_password(data, errors, cleaned_data, 'New password is required')
         
-        if not password:
-            errors['password'] = 'New password is required'
-        elif len(password) < 8:
-            errors['password'] = 'Password must be at least 8 characters'
-        elif not AuthSchemas._validate_password_strength(password):
-            errors['password'] = 'Password must contain at least one letter and one number'
-        else:
-            cleaned_data['password'] = password
-        
-        # Password confirmation
-        if not confirm_password:
-            errors['confirmPassword'] = 'Password confirmation is required'
-        elif password != confirm_password:
-            errors['confirmPassword'] = 'Passwords do not match'
-        
-        is_valid = len(errors) == 0
-        return is_valid, errors if not is_valid else None, cleaned_data if is_valid else None
+        return AuthSchemas._result(errors, cleaned_data)
     
     @staticmethod
     def validate_token_refresh(data: Dict[str, Any]) -> Tuple[bool, Optional[Dict[str, str]], Optional[Dict[str, Any]]]:
@@ -237,16 +223,71 @@ class AuthSchemas:
         else:
             cleaned_data['refresh_token'] = refresh_token
         
-        is_valid = len(errors) == 0
-        return is_valid, errors if not is_valid else None, cleaned_data if is_valid else None
+        return AuthSchemas._result(errors, cleaned_data)
     
     # Helper validation methods
     
+    @staticmethod
+    def _split_full_name(data: Dict[str, Any]) -> Tuple[str, str]:
+        """
+        Resolve (first_name, last_name), falling back to the 'fullName' field
+        
+        'fullName' is only used when neither explicit name is given. A single
+        word fills both names; otherwise the first word is the first name and
+        the rest is the last name.
+        """
+        first_name = data.get('first_name', '').strip()
+        last_name = data.get('last_name', '').strip()
+        full_name = data.get('fullName', '').strip()
+        if full_name and not (first_name or last_name):
+            name_parts = full_name.split(None, 1)
+            first_name = name_parts[0]
+            last_name = name_parts[1] if len(name_parts) > 1 else name_parts[0]
+        return first_name, last_name
+    
+    @staticmethod
+    def _result(errors: Dict[str, str], cleaned_data: Dict[str, Any]) -> Tuple[bool, Optional[Dict[str, str]], Optional[Dict[str, Any]]]:
+        """Build the (is_valid, errors, cleaned_data) tuple returned by every validator"""
+        if errors:
+            return False, errors, None
+        return True, None, cleaned_data
+    
+    @staticmethod
+    def _check_email(data: Dict[str, Any], errors: Dict[str, str], cleaned_data: Dict[str, Any]) -> None:
+        """Validate and normalize the 'email' field"""
+        email = _normalize_email(data.get('email', ''))
+        if not email:
+            errors['email'] = 'Email is required'
+        elif not AuthSchemas._validate_email_format(email):
+            errors['email'] = 'Invalid email format'
+        else:
+            cleaned_data['email'] = email
+    
+    @staticmethod
+    def _check_new_password(data: Dict[str, Any], errors: Dict[str, str], cleaned_data: Dict[str, Any],
+                            required_message: str = 'Password is required') -> None:
+        """Validate the 'password' / 'confirmPassword' pair for a new password"""
+        password = data.get('password', '')
+        confirm_password = data.get('confirmPassword', '')
+        
+        if not password:
+            errors['password'] = required_message
+        elif len(password) < 8:
+            errors['password'] = 'Password must be at least 8 characters'
+        elif not AuthSchemas._validate_password_strength(password):
+            errors['password'] = 'Password must contain at least one letter and one number'
+        else:
+            cleaned_data['password'] = password
+        
+        if not confirm_password:
+            errors['confirmPassword'] = 'Password confirmation is required'
+        elif password != confirm_password:
+            errors['confirmPassword'] = 'Passwords do not match'
+    
     @staticmethod
     def _validate_email_format(email: str) -> bool:
         """Validate email format using regex"""
-        pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return re.match(pattern, email) is not None
+        return _EMAIL_RE.match(email) is not None
     
     @staticmethod
     def _validate_password_strength(password: str) -> bool:
@@ -262,7 +303,7 @@ class AuthSchemas:
     def _validate_phone(phone: str) -> bool:
         """Validate phone number format"""
         # Remove common formatting characters, keeping + if present at start
-        cleaned = re.sub(r'[\s\-\(\)]', '', phone)
+        cleaned = _PHONE_FORMATTING_RE.sub('', phone)
         # Check integrity
         if not cleaned: 
             return False
@@ -273,4 +314,6 @@ class AuthSchemas:
         else:
             digits = cleaned
             
-        return digits.isdigit() and 10 <= len(digits) <= 15
+        # ASCII digits only: str.isdigit() would also accept non-ASCII digits
+        raw = digits.encode('ascii', errors='ignore')
+        return len(raw) == len(digits) and 10 <= len(raw) <= 15 and not raw.translate(None, _ASCII_DIGITS)
@@ -1,6 +1,38 @@
+from flask import Blueprint, current_app, request
+from flask_jwt_extended.exceptions import JWTExtendedException
+from sqlalchemy.exc import SQLAlchemyError
+from werkzeug.exceptions import HTTPException
 
-from flask import Blueprint
+from app.extensions import db
+from app.utils.api_response import APIResponse
 
 client_bp = Blueprint('client', __name__, url_prefix='/api/client/dashboard')
 
+
+@client_bp.errorhandler(SQLAlchemyError)
+def handle_database_error(e):
+    """Roll back and report database failures from routes that don't handle them locally"""
+    db.session.rollback()
+    current_app.logger.exception(f"Database error on {request.method} {request.path}")
+    return APIResponse.error('A database error occurred', status_code=500)
+
+
+@client_bp.errorhandler(Exception)
+def handle_unexpected_error(e):
+    """Report any other unhandled route error in the APIResponse envelope"""
+    if isinstance(e, HTTPException):
+        return e
+    if isinstance(e, JWTExtendedException):
+        # Blueprint handlers outrank app ones for every exception class, so pass
+        # token errors on to the handlers the JWT manager registered on the app
+        app_handlers = current_app.error_handler_spec[None][None]
+        for cls in type(e).__mro__:
+            if cls in app_handlers:
+                return app_handlers[cls](e)
+        raise e
+    db.session.rollback()
+    current_app.logger.exception(f"Unhandled error on {request.method} {request.path}")
+    return APIResponse.error('An unexpected error occurred', status_code=500)
+
+
 from . import dashboard, profile, subscriptions, bookings, flights, packages, payments, settings
@@ -1,33 +1,73 @@
 
 from flask import request, current_app
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from datetime import datetime, timezone, timedelta
 from decimal import Decimal
-import stripe
+from sqlalchemy import func
+from sqlalchemy.orm import joinedload, load_only
 
 from app.extensions import db
-from app.models import User, Booking, Package, Payment
+from app.models import Booking, Package, Payment, Passenger
 from app.models.notification import Notification
 from app.models.enums import BookingStatus, PaymentStatus, SubscriptionTier, UserRole
 from app.api.client.schemas import DashboardSchemas
 from app.utils.api_response import APIResponse
 from app.utils.email import EmailService
 from app.utils.audit_logging import AuditLogger
+from app.utils.search_n_filters import SearchHelper
 from app.services.notification import NotificationService
 from app.models.enums import TripType, BookingType
+from app.utils.cache import get_cached_user
+from app.tasks.background import run_in_background
+from app.tasks.bookings import (
+    send_cancellation_email,
+    create_cancellation_notification,
+    audit_cancellation,
+    process_stripe_refund
+)
 from app.api.client import client_bp
 
+# Cancellation refund policy multipliers
+_REFUND_FULL = Decimal('1.00')
+_REFUND_HALF = Decimal('0.50')
+_REFUND_NONE = Decimal('0.00')
+
+# Bookings in these states can no longer be cancelled
+_NON_CANCELLABLE = frozenset({BookingStatus.CANCELLED, BookingStatus.COMPLETED, BookingStatus.REFUNDED})
+
+# Bookings in these states have no invoice yet
+_NO_INVOICE_STATUSES = frozenset({BookingStatus.REQUESTED, BookingStatus.CANCELLED})
+
+# Tier claim values that qualify for the full-refund policy
+_PREMIUM_TIERS = frozenset({SubscriptionTier.SILVER.value, SubscriptionTier.GOLD.value})
+
+# Refund multiplier keyed by (is_premium, departure bucket); premium members
+# always get a full refund
+_REFUND_TABLE = {
+    (True, 0): _REFUND_FULL,
+    (True, 1): _REFUND_FULL,
+    (True, 2): _REFUND_FULL,
+    (False, 0): _REFUND_FULL,
+    (False, 1): _REFUND_HALF,
+    (False, 2): _REFUND_NONE,
+}
+
+
 @client_bp.route('/bookings', methods=['GET'])
 @jwt_required()
 def get_bookings():
     """
     Get user bookings with filters and pagination
+    
+    Pages are keyset (cursor) based by default: pass the returned
+    nextCursor as ?cursor= to fetch the following page. Passing ?page= or
+    ?includeTotal=true switches to offset pagination with total counts.
     """
     try:
         current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        claims = get_jwt()
         
-        if not user or not user.is_active:
+        if not claims.get('act'):
             return APIResponse.unauthorized('User not found or inactive')
         
         # Get query parameters
@@ -37,7 +77,9 @@ def get_bookings():
             'startDate': request.args.get('startDate', '').strip(),
             'endDate': request.args.get('endDate', '').strip(),
             'page': request.args.get('page', 1),
-            'perPage': request.args.get('perPage', 10)
+            'perPage': request.args.get('perPage', 10),
+            'cursor': request.args.get('cursor', '').strip(),
+            'includeTotal': request.args.get('includeTotal', '')
         }
         
         # Validate filters
@@ -45,8 +87,10 @@ def get_bookings():
         if not is_valid:
             return APIResponse.validation_error(errors)
         
-        # Build query
-        query = Booking.query.filter_by(user_id=current_user_id)
+        # Build query (list view only needs the summary columns)
+        query = Booking.query.options(
+            load_only(*Booking.summary_columns())
+        ).filter_by(user_id=current_user_id)
         
         # Apply filters
         if cleaned_data.get('status'):
@@ -61,39 +105,73 @@ def get_bookings():
         if cleaned_data.get('end_date'):
             query = query.filter(Booking.departure_date <= cleaned_data['end_date'])
         
-        # Order by creation date (newest first)
-        query = query.order_by(Booking.created_at.desc())
-        
-        # Paginate
+        # Paginate (newest first)
         page = cleaned_data.get('page', 1)
         per_page = cleaned_data.get('per_page', 10)
         
-        pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+        if cleaned_data.get('include_total') or 'page' in request.args:
+            pagination = query.order_by(Booking.created_at.desc()).paginate(
+                page=page, per_page=per_page, error_out=False
+            )
+            page_items = pagination.items
+            pagination_data = {
+                'page': pagination.page,
+                'perPage': pagination.per_page,
+                'totalPages': pagination.pages,
+                'totalItems': pagination.total,
+                'hasNext': pagination.has_next,
+                'hasPrev': pagination.has_prev
+            }
+        else:
+            keyset_page = SearchHelper.keyset_paginate(
+                query, Booking.created_at, Booking.id,
+                cursor=cleaned_data.get('cursor'),
+                per_page=per_page
+            )
+            page_items = keyset_page['items']
+            pagination_data = {
+                'perPage': keyset_page['per_page'],
+                'hasNext': keyset_page['has_next'],
+                'hasPrev': keyset_page['has_prev'],
+                'nextCursor': keyset_page['next_cursor']
+            }
+        
+        # Latest payment status for every booking on the page in a single query
+        latest_payment_status = {}
+        booking_ids = [booking.id for booking in page_items]
+        if booking_ids:
+            ranked_payments = db.session.query(
+                Payment.booking_id,
+                Payment.status,
+                func.row_number().over(
+                    partition_by=Payment.booking_id,
+                    order_by=Payment.created_at.desc()
+                ).label('rn')
+            ).filter(Payment.booking_id.in_(booking_ids)).subquery()
+            
+            latest_payment_status = dict(
+                db.session.query(ranked_payments.c.booking_id, ranked_payments.c.status)
+                .filter(ranked_payments.c.rn == 1)
+                .all()
+            )
         
         bookings_data = []
-        for booking in pagination.items:
-            booking_dict = booking.to_dict()
+        for booking in page_items:
+            booking_dict = booking.to_summary_dict()
             
             # Add passenger count
-            booking_dict['passengerCount'] = booking.get_total_passengers()
+            booking_dict['passengerCount'] = booking_dict['total_passengers']
             
             # Add payment status
-            latest_payment = Payment.query.filter_by(booking_id=booking.id).order_by(Payment.created_at.desc()).first()
-            booking_dict['paymentStatus'] = latest_payment.status.value if latest_payment else 'pending'
+            payment_status = latest_payment_status.get(booking.id)
+            booking_dict['paymentStatus'] = payment_status.value if payment_status else 'pending'
             
             bookings_data.append(booking_dict)
         
         return APIResponse.success(
             data={
                 'bookings': bookings_data,
-                'pagination': {
-                    'page': pagination.page,
-                    'perPage': pagination.per_page,
-                    'totalPages': pagination.pages,
-                    'totalItems': pagination.total,
-                    'hasNext': pagination.has_next,
-                    'hasPrev': pagination.has_prev
-                }
+                'pagination': pagination_data
             },
             message='Bookings retrieved successfully'
         )
@@ -103,6 +181,63 @@ def get_bookings():
         return APIResponse.error('An error occurred while fetching bookings')
 
 
+def _detail_passengers(booking_id):
+    """Serialized passengers of a booking"""
+    return [
+        {
+            'id': passenger.id,
+            'firstName': passenger.first_name,
+            'lastName': passenger.last_name,
+            'dateOfBirth': passenger.date_of_birth.isoformat() if passenger.date_of_birth else None,
+            'passportNumber': passenger.passport_number,
+            'nationality': passenger.nationality,
+            'passengerType': passenger.passenger_type
+        }
+        for passenger in Passenger.query.filter_by(booking_id=booking_id).all()
+    ]
+
+
+def _detail_payments(booking_id):
+    """Serialized payments of a booking, plus when the first paid one was paid"""
+    booking_payments = Payment.query.options(
+        load_only(
+            Payment.id,
+            Payment.amount,
+            Payment.currency,
+            Payment.status,
+            Payment.payment_method,
+            Payment.paid_at,
+            Payment.created_at
+        )
+    ).filter_by(booking_id=booking_id).all()
+    
+    paid_at_date = next(
+        (payment.paid_at for payment in booking_payments if payment.status == PaymentStatus.PAID),
+        None
+    )
+    payments = [
+        {
+            'id': payment.id,
+            'amount': float(payment.amount),
+            'currency': payment.currency,
+            'status': payment.status.value,
+            'paymentMethod': payment.payment_method,
+            'paidAt': payment.paid_at.isoformat() if payment.paid_at else None,
+            'createdAt': payment.created_at.isoformat()
+        }
+        for payment in booking_payments
+    ]
+    return payments, paid_at_date
+
+
+def _detail_updates(booking_id):
+    """Serialized notifications about a booking, newest first"""
+    notifications = Notification.query.filter_by(
+        booking_id=booking_id
+    ).order_by(Notification.created_at.desc()).all()
+    return [notification.to_dict() for notification in notifications]
+
+
 @client_bp.route('/bookings/<booking_id>', methods=['GET'])
 @jwt_required()
 def get_booking_details(booking_id):
@@ -111,53 +246,51 @@ def get_booking_details(booking_id):
     """
     try:
         current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        claims = get_jwt()
         
-        if not user or not user.is_active:
+        if not claims.get('act'):
             return APIResponse.unauthorized('User not found or inactive')
         
-        # Get booking
-        booking = Booking.query.filter_by(id=booking_id, user_id=current_user_id).first()
+        # Get booking together with its package and agent in one round trip
+        booking = Booking.query.options(
+            joinedload(Booking.package).load_only(
+                Package.id,
+                Package.name,
+                Package.destination_city,
+                Package.destination_country,
+                Package.duration_days,
+                Package.duration_nights,
+                Package.hotel_name,
+                Package.hotel_rating
+            ),
+            joinedload(Booking.agent)
+        ).filter_by(id=booking_id, user_id=current_user_id).first()
         
         if not booking:
             return APIResponse.not_found('Booking not found')
         
-        # Get booking details
-        booking_dict = booking.to_dict()
-        
-        # Add passengers
-        passengers = []
-        for passenger in booking.passengers:
-            passengers.append({
-                'id': passenger.id,
-                'firstName': passenger.first_name,
-                'lastName': passenger.last_name,
-                'dateOfBirth': passenger.date_of_birth.isoformat() if passenger.date_of_birth else None,
-                'passportNumber': passenger.passport_number,
-                'nationality': passenger.nationality,
-                'passengerType': passenger.passenger_type
-            })
+        # Get booking details (passengers/payments are serialized below, so skip
+        # the relation queries to_dict would otherwise issue)
+        booking_dict = booking.to_dict(include_relations=False)
+        booking_dict['agent'] = (
+            {
+                'id': booking.agent.id,
+                'name': booking.agent.get_full_name(),
+                'email': booking.agent.email
+            }
+            if booking.agent else None
+        )
         
+        # Passengers, payments and updates: one indexed lookup each on the request session
+        passengers = _detail_passengers(booking.id)
+        payments, paid_at_date = _detail_payments(booking.id)
+        updates = _detail_updates(booking.id)
         booking_dict['passengers'] = passengers
-        
-        # Add payments
-        payments = []
-        for payment in booking.payments:
-            payments.append({
-                'id': payment.id,
-                'amount': float(payment.amount),
-                'currency': payment.currency,
-                'status': payment.status.value,
-                'paymentMethod': payment.payment_method,
-                'paidAt': payment.paid_at.isoformat() if payment.paid_at else None,
-                'createdAt': payment.created_at.isoformat()
-            })
-        
         booking_dict['payments'] = payments
         
         # Add package details if applicable
         if booking.package_id:
-            package = Package.query.get(booking.package_id)
+            package = booking.package
             if package:
                 booking_dict['package'] = {
                     'id': package.id,
@@ -171,13 +304,6 @@ def get_booking_details(booking_id):
         # --- Milestone 2 Enrichment ---
         
         # 1. Timeline
-        # Determine timestamps based on available data
-        paid_at_date = None
-        for p in booking.payments:
-            if p.status == PaymentStatus.PAID:
-                paid_at_date = p.paid_at
-                break
-        
         booking_dict['timeline'] = {
             'requestedAt': booking.created_at.isoformat(),
             'reviewedAt': None, # To be implemented with Admin reviews
@@ -187,12 +313,11 @@ def get_booking_details(booking_id):
         }
 
         # 2. Updates (Notifications integration)
-        notifications = Notification.query.filter_by(booking_id=booking.id).order_by(Notification.created_at.desc()).all()
-        booking_dict['updates'] = [n.to_dict() for n in notifications]
+        booking_dict['updates'] = updates
 
         # 3. Documents (Placeholders for now, or real links if endpoints exist)
         booking_dict['documents'] = {
-            'invoiceUrl': f"/api/client/bookings/{booking.id}/invoice" if booking.status not in [BookingStatus.REQUESTED, BookingStatus.CANCELLED] else None,
+            'invoiceUrl': f"/api/client/bookings/{booking.id}/invoice" if booking.status not in _NO_INVOICE_STATUSES else None,
             'ticketUrl': f"/api/client/bookings/{booking.id}/ticket" if booking.status == BookingStatus.CONFIRMED else None
         }
         
@@ -214,11 +339,13 @@ def cancel_booking(booking_id):
     """
     try:
         current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        claims = get_jwt()
         
-        if not user or not user.is_active:
+        if not claims.get('act'):
             return APIResponse.unauthorized('User not found or inactive')
         
+        ip_address, user_agent = AuditLogger.request_origin()
+        
         # Get booking
         booking = Booking.query.filter_by(id=booking_id, user_id=current_user_id).first()
         
@@ -226,7 +353,7 @@ def cancel_booking(booking_id):
             return APIResponse.not_found('Booking not found')
         
         # Check if booking can be cancelled
-        if booking.status in [BookingStatus.CANCELLED, BookingStatus.COMPLETED, BookingStatus.REFUNDED]:
+        if booking.status in _NON_CANCELLABLE:
             return APIResponse.error(f'Cannot cancel booking with status: {booking.status.value}')
         
         data = request.get_json() or {}
@@ -236,30 +363,29 @@ def cancel_booking(booking_id):
         if not is_valid:
             return APIResponse.validation_error(errors)
         
+        now = datetime.now(timezone.utc)
+        
         # Update booking status
         booking.status = BookingStatus.CANCELLED
-        booking.cancelled_at = datetime.now(timezone.utc)
+        booking.cancelled_at = now
         booking.notes = f"Cancelled by user. Reason: {cleaned_data.get('reason', 'Not specified')}"
         
         # Handle refund if requested
         refund_amount = Decimal('0.00')
+        stripe_refund_payment_id = None
         if cleaned_data.get('request_refund', True):
             # Calculate refund based on cancellation policy
             if booking.departure_date:
-                hours_until_departure = (booking.departure_date - datetime.now(timezone.utc)).total_seconds() / 3600
-                
-                if hours_until_departure >= 24:
-                    refund_percentage = 1.0  # 100% refund
-                elif hours_until_departure >= 12:
-                    refund_percentage = 0.5  # 50% refund
-                else:
-                    refund_percentage = 0.0  # No refund
+                departure = booking.departure_date
+                if departure.tzinfo is None:
+                    departure = departure.replace(tzinfo=timezone.utc)
+                hours_until_departure = (departure - now).total_seconds() / 3600
                 
-                # Check subscription tier for better refund policy
-                if user.subscription_tier in [SubscriptionTier.SILVER, SubscriptionTier.GOLD]:
-                    refund_percentage = 1.0  # Full refund for premium members
+                # Refund policy: bucket 0 is 24h+ out, 1 is 12-24h, 2 is under 12h
+                bucket = 0 if hours_until_departure >= 24 else 1 if hours_until_departure >= 12 else 2
+                refund_percentage = _REFUND_TABLE[(claims.get('tier') in _PREMIUM_TIERS, bucket)]
                 
-                refund_amount = booking.total_price * Decimal(str(refund_percentage))
+                refund_amount = booking.total_price * refund_percentage
                 
                 # Find the payment to refund
                 payment = Payment.query.filter_by(
@@ -268,22 +394,10 @@ def cancel_booking(booking_id):
                 ).first()
                 
                 if payment and refund_amount > 0:
-                    # Process refund via Stripe if payment was made with Stripe
+                    # Stripe refunds are issued after commit so the network call
+                    # never holds the booking/payment transaction open
                     if payment.stripe_charge_id:
-                        try:
-                            stripe.api_key = current_app.config.get('STRIPE_SECRET_KEY')
-                            refund = stripe.Refund.create(
-                                charge=payment.stripe_charge_id,
-                                amount=int(refund_amount * 100)  # Convert to cents
-                            )
-                            
-                            payment.refund_amount = refund_amount
-                            payment.status = PaymentStatus.REFUNDED
-                            payment.refunded_at = datetime.now(timezone.utc)
-                            booking.status = BookingStatus.REFUNDED
-                        except stripe.error.StripeError as e:
-                            current_app.logger.error(f"Stripe refund error: {str(e)}")
-                            # Continue with cancellation even if refund fails
+                        stripe_refund_payment_id = payment.id
                     else:
                         # Manual refund processing
                         payment.refund_amount = refund_amount
@@ -291,59 +405,41 @@ def cancel_booking(booking_id):
         
         db.session.commit()
         
-        # Send cancellation email
-        try:
-            EmailService.send_email(
-                to=user.email,
-                subject=f'Booking Cancelled - {booking.booking_reference}',
-                body=f"""
-                Hello {user.first_name},
-                
-                Your booking {booking.booking_reference} has been cancelled.
-                
-                Refund Amount: ${float(refund_amount):.2f}
-                
-                If you have any questions, please contact our support team.
-                
-                Thank you for using Thrive Travel.
-                """
-            )
-        except Exception as e:
-            current_app.logger.error(f"Failed to send cancellation email: {str(e)}")
-        
-        # Create notification
-        try:
-            NotificationService.create_notification(
-                user_id=user.id,
-                notification_type='booking_cancelled',
-                title='Booking Cancelled',
-                message=f'Your booking {booking.booking_reference} has been cancelled. Refund: ${float(refund_amount):.2f}',
-                booking_id=booking.id
+        if stripe_refund_payment_id:
+            run_in_background(
+                process_stripe_refund,
+                stripe_refund_payment_id,
+                booking.id,
+                int(refund_amount * 100)  # Convert to cents
             )
-        except Exception as e:
-            current_app.logger.error(f"Failed to create notification: {str(e)}")
         
-        # Log cancellation
-        AuditLogger.log_action(
-            user_id=user.id,
-            action='booking_cancelled',
-            entity_type='booking',
-            entity_id=booking.id,
-            description=f'Booking {booking.booking_reference} cancelled',
-            ip_address=request.remote_addr,
-            user_agent=request.headers.get('User-Agent')
+        # Email and notification run off the request path; the audit entry is batched
+        refund_value = float(refund_amount)
+        run_in_background(send_cancellation_email, current_user_id, booking.booking_reference, refund_value)
+        run_in_background(
+            create_cancellation_notification,
+            current_user_id, booking.id, booking.booking_reference, refund_value
+        )
+        audit_cancellation(
+            current_user_id, booking.id, booking.booking_reference,
+            ip_address=ip_address,
+            user_agent=user_agent
         )
         
+        refund_pending = bool(stripe_refund_payment_id) and booking.status != BookingStatus.REFUNDED
+        
         return APIResponse.success(
             data={
                 'booking': {
                     'id': booking.id,
                     'bookingReference': booking.booking_reference,
                     'status': booking.status.value,
-                    'refundAmount': float(refund_amount)
+                    'refundAmount': float(refund_amount),
+                    'refundPending': refund_pending
                 }
             },
-            message='Booking cancelled successfully'
+            message='Booking cancelled successfully',
+            status_code=202 if refund_pending else 200
         )
         
     except Exception as e:
@@ -360,10 +456,16 @@ def request_booking():
     """
     try:
         current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        claims = get_jwt()
+        if not claims.get('act'):
+            return APIResponse.unauthorized('User not found or inactive')
         
-        if not user or not user.is_active:
+        # Name and email for the notifications only
+        user = get_cached_user(current_user_id)
+        if not user:
             return APIResponse.unauthorized('User not found or inactive')
+        
+        ip_address, user_agent = AuditLogger.request_origin()
             
         data = request.get_json() or {}
         
@@ -491,14 +593,14 @@ def request_booking():
 
         
         # Log Action
-        AuditLogger.log_action(
+        AuditLogger.enqueue(
             user_id=user.id,
             action='booking_requested',
             entity_type='booking',
             entity_id=booking.id,
             description=f'Requested booking {booking.booking_reference}',
-            ip_address=request.remote_addr,
-            user_agent=request.headers.get('User-Agent')
+            ip_address=ip_address,
+            user_agent=user_agent
         )
 
         return APIResponse.success(
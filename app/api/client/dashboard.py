@@ -1,17 +1,152 @@
 
 from flask import request, current_app
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from datetime import datetime, timedelta, timezone
+from functools import partial
 from decimal import Decimal
-from sqlalchemy import and_, func
+from sqlalchemy import and_, case, func
+from sqlalchemy.orm import load_only
 
 from app.extensions import db
 from app.models import User, Booking, Payment, Notification
-from app.models.enums import BookingStatus, PaymentStatus
+from app.models.enums import BookingStatus, PaymentStatus, SubscriptionTier
 from app.utils.api_response import APIResponse
+from app.utils.search_n_filters import SearchHelper
+from app.utils.cache import dashboard_summary_cache, dashboard_chart_cache
+from app.tasks.background import run_parallel
 
 from app.api.client import client_bp
 
+def _summary_booking_stats(user_id, now):
+    """Dashboard booking counts in a single aggregate pass"""
+    upcoming_date = now + timedelta(days=30)
+    
+    return db.session.query(
+        func.count(Booking.id).label('total'),
+        func.count(case((Booking.status == BookingStatus.CONFIRMED, 1))).label('confirmed'),
+        # Upcoming bookings (next 30 days)
+        func.count(case((
+            and_(
+                Booking.departure_date >= now,
+                Booking.departure_date <= upcoming_date,
+                Booking.status.in_([BookingStatus.CONFIRMED, BookingStatus.PENDING])
+            ), 1
+        ))).label('upcoming'),
+        # Active trips (package tours)
+        func.count(case((
+            and_(
+                Booking.booking_type == 'package',
+                Booking.status == BookingStatus.CONFIRMED,
+                Booking.departure_date >= now
+            ), 1
+        ))).label('active_trips')
+    ).filter(Booking.user_id == user_id).one()
+
+
+def _summary_account_totals(user_id):
+    """Total spent, unread notifications and subscription state in one round trip"""
+    total_spent_subq = db.session.query(func.sum(Payment.amount)).filter(
+        Payment.user_id == user_id,
+        Payment.status == PaymentStatus.PAID
+    ).scalar_subquery()
+    
+    unread_subq = db.session.query(func.count(Notification.id)).filter(
+        Notification.user_id == user_id,
+        Notification.is_read == False
+    ).scalar_subquery()
+    
+    tier_subq = db.session.query(User.subscription_tier).filter(
+        User.id == user_id
+    ).scalar_subquery()
+    
+    subscription_end_subq = db.session.query(User.subscription_end).filter(
+        User.id == user_id
+    ).scalar_subquery()
+    
+    return db.session.query(
+        total_spent_subq, unread_subq, tier_subq, subscription_end_subq
+    ).one()
+
+
+def _summary_recent_bookings(user_id):
+    """Last 5 bookings, serialized for the dashboard cards"""
+    recent_bookings = Booking.query.options(
+        load_only(*Booking.summary_columns())
+    ).filter_by(
+        user_id=user_id
+    ).order_by(Booking.created_at.desc()).limit(5).all()
+    
+    return [booking.to_summary_dict() for booking in recent_bookings]
+
+
+def _summary_chart_data(user_id, now):
+    """Monthly spending for the last 12 months in one grouped query"""
+    month_index = now.year * 12 + now.month - 1
+    chart_months = [divmod(month_index - i, 12) for i in range(11, -1, -1)]
+    chart_start = datetime(chart_months[0][0], chart_months[0][1] + 1, 1, tzinfo=timezone.utc)
+    
+    paid_year = func.extract('year', Payment.paid_at)
+    paid_month = func.extract('month', Payment.paid_at)
+    monthly_totals = db.session.query(
+        paid_year, paid_month, func.sum(Payment.amount)
+    ).filter(
+        Payment.user_id == user_id,
+        Payment.status == PaymentStatus.PAID,
+        Payment.paid_at >= chart_start
+    ).group_by(paid_year, paid_month).all()
+    
+    totals_by_month = {(int(year), int(month)): total for year, month, total in monthly_totals}
+    
+    chart_data = []
+    for year, month_offset in chart_months:
+        month_start = datetime(year, month_offset + 1, 1)
+        chart_data.append({
+            'name': month_start.strftime('%b'),
+            'total': float(totals_by_month.get((year, month_offset + 1)) or Decimal('0.00'))
+        })
+    
+    return chart_data
+
+
+def _build_dashboard_summary(user_id):
+    """Compute the full dashboard summary payload for a user"""
+    now = datetime.now(timezone.utc)
+    chart_data = dashboard_chart_cache.get(user_id)
+    
+    # Independent reads, run concurrently on separate connections
+    calls = [
+        partial(_summary_booking_stats, user_id, now),
+        partial(_summary_account_totals, user_id),
+        partial(_summary_recent_bookings, user_id),
+    ]
+    if chart_data is None:
+        calls.append(partial(_summary_chart_data, user_id, now))
+    
+    results = run_parallel(*calls)
+    booking_stats, account_totals, recent_bookings = results[:3]
+    if chart_data is None:
+        chart_data = results[3]
+        dashboard_chart_cache.set(user_id, chart_data)
+    
+    total_spent, unread_notifications, subscription_tier, subscription_end = account_totals
+    total_spent = total_spent or Decimal('0.00')
+    
+    return {
+        'stats': {
+            'totalBookings': booking_stats.total,
+            'confirmedBookings': booking_stats.confirmed,
+            'totalSpent': float(total_spent),
+            'upcomingBookings': booking_stats.upcoming,
+            'activeTrips': booking_stats.active_trips,
+            'unreadNotifications': unread_notifications
+        },
+        'recentBookings': recent_bookings,
+        'chartData': chart_data,
+        'subscriptionTier': subscription_tier.value if subscription_tier else SubscriptionTier.NONE.value,
+        'hasActiveSubscription': User.subscription_active_until(subscription_end)
+    }
+
+
 @client_bp.route('/summary', methods=['GET'])
 @jwt_required()
 def get_dashboard_summary():
@@ -24,92 +159,19 @@ def get_dashboard_summary():
     """
     try:
         current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        claims = get_jwt()
         
-        if not user or not user.is_active:
+        if not claims.get('act'):
             return APIResponse.unauthorized('User not found or inactive')
         
-        # Get booking statistics
-        total_bookings = Booking.query.filter_by(user_id=current_user_id).count()
-        
-        confirmed_bookings = Booking.query.filter_by(
-            user_id=current_user_id,
-            status=BookingStatus.CONFIRMED
-        ).count()
-        
-        # Calculate total spent
-        total_spent = db.session.query(func.sum(Payment.amount)).filter(
-            Payment.user_id == current_user_id,
-            Payment.status == PaymentStatus.PAID
-        ).scalar() or Decimal('0.00')
-        
-        # Get upcoming bookings (next 30 days)
-        upcoming_date = datetime.now(timezone.utc) + timedelta(days=30)
-        upcoming_bookings = Booking.query.filter(
-            and_(
-                Booking.user_id == current_user_id,
-                Booking.departure_date >= datetime.now(timezone.utc),
-                Booking.departure_date <= upcoming_date,
-                Booking.status.in_([BookingStatus.CONFIRMED, BookingStatus.PENDING])
-            )
-        ).count()
-        
-        # Get active trips (package tours)
-        active_trips = Booking.query.filter(
-            and_(
-                Booking.user_id == current_user_id,
-                Booking.booking_type == 'package',
-                Booking.status == BookingStatus.CONFIRMED,
-                Booking.departure_date >= datetime.now(timezone.utc)
-            )
-        ).count()
-        
-        # Get recent bookings (last 5)
-        recent_bookings = Booking.query.filter_by(
-            user_id=current_user_id
-        ).order_by(Booking.created_at.desc()).limit(5).all()
-        
-        # Get monthly spending data for chart (last 12 months)
-        chart_data = []
-        for i in range(11, -1, -1):
-            month_start = datetime.now(timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0) - timedelta(days=30*i)
-            month_end = (month_start + timedelta(days=32)).replace(day=1) - timedelta(seconds=1)
-            
-            monthly_total = db.session.query(func.sum(Payment.amount)).filter(
-                and_(
-                    Payment.user_id == current_user_id,
-                    Payment.status == PaymentStatus.PAID,
-                    Payment.paid_at >= month_start,
-                    Payment.paid_at <= month_end
-                )
-            ).scalar() or Decimal('0.00')
-            
-            chart_data.append({
-                'name': month_start.strftime('%b'),
-                'total': float(monthly_total)
-            })
-        
-        # Get unread notifications count
-        unread_notifications = Notification.query.filter_by(
-            user_id=current_user_id,
-            is_read=False
-        ).count()
+        # Cached until the user's bookings, payments, notifications or account change;
+        # concurrent cold requests share one computation
+        summary = dashboard_summary_cache.get_or_set(
+            current_user_id, lambda: _build_dashboard_summary(current_user_id)
+        )
         
         return APIResponse.success(
-            data={
-                'stats': {
-                    'totalBookings': total_bookings,
-                    'confirmedBookings': confirmed_bookings,
-                    'totalSpent': float(total_spent),
-                    'upcomingBookings': upcoming_bookings,
-                    'activeTrips': active_trips,
-                    'unreadNotifications': unread_notifications
-                },
-                'recentBookings': [booking.to_dict() for booking in recent_bookings],
-                'chartData': chart_data,
-                'subscriptionTier': user.subscription_tier.value,
-                'hasActiveSubscription': user.has_active_subscription()
-            },
+            data=summary,
             message='Dashboard summary retrieved successfully'
         )
         
@@ -124,7 +186,8 @@ def get_notifications():
     Get user notifications
     
     Query Parameters:
-        page: Page number (default: 1)
+        cursor: Opaque cursor from a previous page's nextCursor
+        page: Page number; switches to offset pagination with totals
         perPage: Items per page (default: 20)
         unreadOnly: Show only unread notifications (default: false)
     
@@ -134,9 +197,9 @@ def get_notifications():
     """
     try:
         current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        claims = get_jwt()
         
-        if not user or not user.is_active:
+        if not claims.get('act'):
             return APIResponse.unauthorized('User not found or inactive')
         
         # Get query parameters
@@ -144,29 +207,51 @@ def get_notifications():
         per_page = int(request.args.get('perPage', 20))
         unread_only = request.args.get('unreadOnly', 'false').lower() == 'true'
         
+        cursor = None
+        if request.args.get('cursor'):
+            cursor = SearchHelper.decode_cursor(request.args['cursor'])
+            if cursor is None:
+                return APIResponse.validation_error({'cursor': 'Invalid pagination cursor'})
+        
         # Build query
         query = Notification.query.filter_by(user_id=current_user_id)
         
         if unread_only:
             query = query.filter_by(is_read=False)
         
-        # Order by creation date (newest first)
-        query = query.order_by(Notification.created_at.desc())
-        
-        # Paginate
-        pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+        # Offset pagination (with totals) only when a page number is asked for;
+        # otherwise seek newest first on (created_at, id) without a COUNT
+        if 'page' in request.args:
+            pagination = query.order_by(Notification.created_at.desc()).paginate(
+                page=page, per_page=per_page, error_out=False
+            )
+            page_items = pagination.items
+            pagination_data = {
+                'page': pagination.page,
+                'perPage': pagination.per_page,
+                'totalPages': pagination.pages,
+                'totalItems': pagination.total
+            }
+        else:
+            keyset_page = SearchHelper.keyset_paginate(
+                query, Notification.created_at, Notification.id,
+                cursor=cursor,
+                per_page=per_page
+            )
+            page_items = keyset_page['items']
+            pagination_data = {
+                'perPage': keyset_page['per_page'],
+                'hasNext': keyset_page['has_next'],
+                'hasPrev': keyset_page['has_prev'],
+                'nextCursor': keyset_page['next_cursor']
+            }
         
-        notifications_data = [notification.to_dict() for notification in pagination.items]
+        notifications_data = [notification.to_dict() for notification in page_items]
         
         return APIResponse.success(
             data={
                 'notifications': notifications_data,
-                'pagination': {
-                    'page': pagination.page,
-                    'perPage': pagination.per_page,
-                    'totalPages': pagination.pages,
-                    'totalItems': pagination.total
-                }
+                'pagination': pagination_data
             },
             message='Notifications retrieved successfully'
         )
@@ -189,9 +274,9 @@ def mark_notification_read(notification_id):
     """
     try:
         current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        claims = get_jwt()
         
-        if not user or not user.is_active:
+        if not claims.get('act'):
             return APIResponse.unauthorized('User not found or inactive')
         
         # Get notification
@@ -226,9 +311,9 @@ def submit_contact_form():
     """
     try:
         current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        claims = get_jwt()
         
-        if not user or not user.is_active:
+        if not claims.get('act'):
             return APIResponse.unauthorized('User not found or inactive')
         
         data = request.get_json()
@@ -1,102 +1,127 @@
 
 from flask import request, current_app
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from sqlalchemy import and_, or_
+from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
+from sqlalchemy import and_, or_, case, func
 from datetime import datetime, timezone
+from decimal import Decimal
 
-from app.models import User, Booking
+from app.extensions import db
+from app.models import Booking, Passenger, Notification
 from app.models.enums import BookingStatus, BookingType
 from app.utils.api_response import APIResponse
 
 from app.api.client import client_bp
 
+# Status filter lookup; BookingStatus values are the lowercase names
+_STATUS_BY_VALUE = {status.value: status for status in BookingStatus}
+
+# UI label per booking status
+_STATUS_LABELS = {
+    BookingStatus.REQUESTED: "Quote Requested",
+    BookingStatus.PENDING: "Quote Prepared",
+    BookingStatus.CONFIRMED: "Booking Confirmed",
+    BookingStatus.CANCELLED: "Cancelled",
+}
+
+# Pending bookings with a service fee, keyed by whether it has been paid
+_PENDING_LABELS = {
+    False: "Awaiting Service Fee",
+    True: "Processing Tickets",
+}
+
+# Confirmed bookings, keyed by (airline fare paid, ticket numbers issued)
+_CONFIRMED_LABELS = {
+    (False, False): "Awaiting Airline Payment",
+    (False, True): "Awaiting Airline Payment",
+    (True, False): "Ticketing in Progress",
+    (True, True): "Tickets Issued",
+}
+
 @client_bp.route('/flights', methods=['GET'])
 @jwt_required()
 def get_flights():
     """
     Get user flight bookings and stats
     
+    Query Parameters:
+        status: Booking status filter (default: all)
+        page: Page number (default: 1)
+        perPage: Items per page (default: 50, max: 100)
+    
     Returns:
         200: Flight summary stats and list of flight bookings
         401: Unauthorized
     """
     try:
         current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        claims = get_jwt()
         
-        if not user or not user.is_active:
+        if not claims.get('act'):
             return APIResponse.unauthorized('User not found or inactive')
         
-        # Stats
-        upcoming_count = Booking.query.filter(
-            and_(
-                Booking.user_id == current_user_id,
-                Booking.booking_type == BookingType.FLIGHT,
-                Booking.departure_date >= datetime.now(timezone.utc),
-                Booking.status.in_([BookingStatus.CONFIRMED])
-            )
-        ).count()
-        
-        pending_quote_count = Booking.query.filter(
-            and_(
-                Booking.user_id == current_user_id,
-                Booking.booking_type == BookingType.FLIGHT,
-                Booking.status == BookingStatus.PENDING or Booking.status == BookingStatus.REQUESTED
-            )
-        ).count()
-        
-        ticketed_count = Booking.query.filter(
-            and_(
-                Booking.user_id == current_user_id,
-                Booking.booking_type == BookingType.FLIGHT,
-                Booking.status == BookingStatus.CONFIRMED
-            )
-        ).count()
-        
-        cancelled_count = Booking.query.filter(
-            and_(
-                Booking.user_id == current_user_id,
-                Booking.booking_type == BookingType.FLIGHT,
-                Booking.status == BookingStatus.CANCELLED
-            )
-        ).count()
+        # Stats in a single conditional-aggregation pass
+        flight_stats = db.session.query(
+            func.count(case((
+                and_(
+                    Booking.departure_date >= datetime.now(timezone.utc),
+                    Booking.status.in_([BookingStatus.CONFIRMED])
+                ), 1
+            ))).label('upcoming'),
+            func.count(case((
+                Booking.status.in_([BookingStatus.PENDING, BookingStatus.REQUESTED]), 1
+            ))).label('pending_quote'),
+            func.count(case((Booking.status == BookingStatus.CONFIRMED, 1))).label('ticketed'),
+            func.count(case((Booking.status == BookingStatus.CANCELLED, 1))).label('cancelled')
+        ).filter(
+            Booking.user_id == current_user_id,
+            Booking.booking_type == BookingType.FLIGHT
+        ).one()
         
         # Flight List
         # Supports filters: status, search query param handled optionally or by general bookings
         status_filter = request.args.get('status', 'all').lower()
+        page = int(request.args.get('page', 1))
+        per_page = int(request.args.get('perPage', 50))
         
-        query = Booking.query.filter(
+        # Plain rows rather than Booking instances; the list is read-only
+        query = db.session.query(*Booking.row_columns()).filter(
             Booking.user_id == current_user_id,
             Booking.booking_type == BookingType.FLIGHT
         )
         
         if status_filter != 'all' and status_filter:
-             # Map convenient front-end statuses if needed, or use exact enum
-             if status_filter in BookingStatus.__members__.values():
-                 query = query.filter(Booking.status == status_filter)
+            # Unknown statuses are ignored rather than rejected
+            status_enum = _STATUS_BY_VALUE.get(status_filter)
+            if status_enum is not None:
+                query = query.filter(Booking.status == status_enum)
         
         query = query.order_by(Booking.departure_date.desc())
         
-        # Limit for initial view or paginate
-        flights = query.limit(50).all()
+        pagination = query.paginate(page=page, per_page=per_page, max_per_page=100, error_out=False)
         
         flight_list = []
-        for flight in flights:
-            f_dict = flight.to_dict(include_relations=False)
+        for flight in pagination.items:
+            f_dict = Booking.row_to_dict(flight)
             # Enrich with airline name, logo, route if stored in metadata or distinct fields
             # Assuming basic details are in Booking model or related metadata
-            # For now, using standard to_dict response
+            # For now, using the same payload as to_dict(include_relations=False)
             flight_list.append(f_dict)
 
         return APIResponse.success(
             data={
                 'summary': {
-                    'upcoming': upcoming_count,
-                    'pending_quote': pending_quote_count,
-                    'ticketed': ticketed_count,
-                    'cancelled': cancelled_count
+                    'upcoming': flight_stats.upcoming,
+                    'pending_quote': flight_stats.pending_quote,
+                    'ticketed': flight_stats.ticketed,
+                    'cancelled': flight_stats.cancelled
                 },
-                'flights': flight_list
+                'flights': flight_list,
+                'pagination': {
+                    'page': pagination.page,
+                    'perPage': pagination.per_page,
+                    'totalPages': pagination.pages,
+                    'totalItems': pagination.total
+                }
             },
             message="Flights retrieved successfully"
         )
@@ -113,9 +138,9 @@ def get_flight_details(booking_reference):
     """
     try:
         current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        claims = get_jwt()
         
-        if not user or not user.is_active:
+        if not claims.get('act'):
             return APIResponse.unauthorized('User not found or inactive')
             
         booking = Booking.query.filter_by(
@@ -125,54 +150,27 @@ def get_flight_details(booking_reference):
         
         if not booking:
             return APIResponse.not_found('Booking not found')
+        
+        now = datetime.now(timezone.utc)
+        
+        # Maintained on the booking row by the Payment write hooks
+        total_paid = booking.amount_paid or Decimal('0.00')
             
         # --- Construct Spec Response ---
         
         # 1. Status Mapping
-        # Mapping internal status to UI Label logic
-        bs = booking.status
-        ui_status_label = "Processing"
+        # Payment progress: total paid against the service fee and the full price
+        service_fee_paid = booking.service_fee > 0 and total_paid >= booking.service_fee
+        airline_fare_paid = total_paid >= booking.total_price
         
-        # Simple mapper based on spec
-        if bs == BookingStatus.REQUESTED:
-            ui_status_label = "Quote Requested"
-        elif bs == BookingStatus.PENDING: # Pending internal check
-            ui_status_label = "Quote Prepared" 
+        # Mapping internal status to UI Label, refined by payment progress
+        bs = booking.status
+        if bs == BookingStatus.PENDING and booking.service_fee > 0:
+            ui_status_label = _PENDING_LABELS[service_fee_paid]
         elif bs == BookingStatus.CONFIRMED:
-            ui_status_label = "Booking Confirmed"
-        elif bs == BookingStatus.CANCELLED:
-            ui_status_label = "Cancelled"
-            
-        # Logic for "Awaiting Service Fee" vs "Awaiting Airline Payment"
-        # We need to check Payments
-        service_fee_paid = False
-        airline_fare_paid = False
-        
-        # Iterate payments to check what is covered
-        # Ideally Payment model has metadata or type.
-        # For now, we assume if Total Paid >= Service Fee, service fee is paid?
-        # Or if there is ANY payment.
-        
-        total_paid = sum([p.amount for p in booking.payments if p.status.name == 'PAID'])
-        
-        if total_paid >= booking.service_fee and booking.service_fee > 0:
-            service_fee_paid = True
-            
-        # If total paid covers total price?
-        if total_paid >= booking.total_price:
-            airline_fare_paid = True
-            
-        # Refine status based on payment
-        if bs == BookingStatus.PENDING and not service_fee_paid and booking.service_fee > 0:
-             ui_status_label = "Awaiting Service Fee"
-        elif bs == BookingStatus.PENDING and service_fee_paid:
-             ui_status_label = "Processing Tickets" # or "Quote Accepted" / "Service Fee Paid"
-        elif bs == BookingStatus.CONFIRMED and not airline_fare_paid:
-             ui_status_label = "Awaiting Airline Payment"
-        elif bs == BookingStatus.CONFIRMED and airline_fare_paid:
-             ui_status_label = "Tickets Issued" # If ticket numbers exist
-             if not booking.ticket_numbers:
-                 ui_status_label = "Ticketing in Progress"
+            ui_status_label = _CONFIRMED_LABELS[(airline_fare_paid, bool(booking.ticket_numbers))]
+        else:
+            ui_status_label = _STATUS_LABELS.get(bs, "Processing")
 
         # 2. Flight Details
         flight_details = {
@@ -187,8 +185,12 @@ def get_flight_details(booking_reference):
         }
 
         # 3. Passengers
+        booking_passengers = db.session.query(
+            Passenger.first_name, Passenger.last_name, Passenger.passenger_type
+        ).filter(Passenger.booking_id == booking.id).all()
+        
         passengers_data = []
-        for p in booking.passengers:
+        for p in booking_passengers:
             passengers_data.append({
                 "full_name": f"{p.first_name} {p.last_name}",
                 "passenger_type": p.passenger_type.upper() if p.passenger_type else "ADT" 
@@ -230,7 +232,7 @@ def get_flight_details(booking_reference):
                 "type": "AIRLINE_INVOICE",
                 "filename": f"Flight_Invoice_{booking.booking_reference}.pdf",
                 "version": 1,
-                "uploaded_at": booking.confirmed_at.isoformat() if booking.confirmed_at else datetime.now(timezone.utc).isoformat(),
+                "uploaded_at": booking.confirmed_at.isoformat() if booking.confirmed_at else now.isoformat(),
                 "download_url": "#"
             })
         if booking.ticket_numbers:
@@ -239,13 +241,14 @@ def get_flight_details(booking_reference):
                 "type": "TICKET",
                 "filename": f"ETicket_{booking.booking_reference}.pdf",
                 "version": 1,
-                "uploaded_at": booking.confirmed_at.isoformat() if booking.confirmed_at else datetime.now(timezone.utc).isoformat(),
+                "uploaded_at": booking.confirmed_at.isoformat() if booking.confirmed_at else now.isoformat(),
                 "download_url": "#"
             })
 
         # 6. Activity Log (Notifications)
-        from app.models.notification import Notification
-        notifications = Notification.query.filter_by(booking_id=booking.id).order_by(Notification.created_at.desc()).all()
+        notifications = db.session.query(Notification.title, Notification.created_at).filter(
+            Notification.booking_id == booking.id
+        ).order_by(Notification.created_at.desc()).all()
         activity_log = [{
             "message": n.title, # Using title as primary message
             "created_at": n.created_at.isoformat()
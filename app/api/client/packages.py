@@ -1,11 +1,13 @@
 
+from collections import defaultdict
 from flask import request, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from sqlalchemy import or_
+from sqlalchemy.orm import joinedload, load_only
 
-from app.models import User, Package, Booking
+from app.models import User, Package, Booking, Passenger, Payment
 from app.models.enums import BookingType
 from app.utils.api_response import APIResponse
+from app.utils.cache import explore_packages_cache, featured_packages_cache
 
 from app.api.client import client_bp
 
@@ -19,27 +21,35 @@ def explore_packages():
         # Search filters
         search_query = request.args.get('search', '').strip()
         
+        # ILIKE is case-insensitive, so case variants share a cache entry
+        cache_key = search_query.lower()
+        cached_data = explore_packages_cache.get(cache_key)
+        if cached_data is not None:
+            return APIResponse.success(data=cached_data, message="Explore packages retrieved")
+        
         query = Package.query.filter_by(is_active=True)
         
         if search_query:
-            query = query.filter(
-                or_(
-                    Package.name.ilike(f'%{search_query}%'),
-                    Package.destination_city.ilike(f'%{search_query}%'),
-                    Package.destination_country.ilike(f'%{search_query}%')
-                )
-            )
+            query = query.filter(Package.search_document().ilike(f'%{search_query}%'))
             
         packages = query.limit(20).all()
-        featured_packages = Package.query.filter_by(is_featured=True).all()
-        # Find a featured package (e.g. curated one or just random/latest)
-        featured = [p.to_dict() for p in featured_packages] if featured_packages else []
+        
+        # The featured list does not depend on the search, so it is cached once
+        featured = featured_packages_cache.get('featured')
+        if featured is None:
+            featured_packages = Package.query.filter_by(is_featured=True).all()
+            # Find a featured package (e.g. curated one or just random/latest)
+            featured = [p.to_dict() for p in featured_packages] if featured_packages else []
+            featured_packages_cache.set('featured', featured)
+
+        data = {
+            'featured': featured,
+            'all_packages': [p.to_dict() for p in packages]
+        }
+        explore_packages_cache.set(cache_key, data)
 
         return APIResponse.success(
-            data={
-                'featured': featured,
-                'all_packages': [p.to_dict() for p in packages]
-            },
+            data=data,
             message="Explore packages retrieved"
         )
     except Exception as e:
@@ -57,14 +67,46 @@ def my_packages():
         current_user_id = get_jwt_identity()
         
         # Booked packages
-        booked_query = Booking.query.filter(
+        booked_query = Booking.query.options(
+            joinedload(Booking.package).load_only(
+                Package.name,
+                Package.featured_image,
+                Package.destination_city,
+                Package.destination_country
+            ),
+            joinedload(Booking.agent)
+        ).filter(
             Booking.user_id == current_user_id,
             Booking.booking_type == BookingType.PACKAGE
         ).order_by(Booking.created_at.desc()).all()
         
+        # Passengers and payments for every booking in two IN queries, rather
+        # than the two per booking that to_dict() would issue
+        booking_ids = [b.id for b in booked_query]
+        passengers_by_booking = defaultdict(list)
+        payments_by_booking = defaultdict(list)
+        if booking_ids:
+            for passenger in Passenger.query.filter(Passenger.booking_id.in_(booking_ids)):
+                passengers_by_booking[passenger.booking_id].append(passenger.to_dict())
+            payments = Payment.query.options(
+                load_only(*Payment.summary_columns(), Payment.booking_id)
+            ).filter(Payment.booking_id.in_(booking_ids))
+            for payment in payments:
+                payments_by_booking[payment.booking_id].append(payment.to_dict())
+        
         booked_list = []
         for b in booked_query:
-            b_data = b.to_dict()
+            b_data = b.to_dict(include_relations=False)
+            b_data['passengers'] = passengers_by_booking[b.id]
+            b_data['payments'] = payments_by_booking[b.id]
+            b_data['agent'] = (
+                {
+                    'id': b.agent.id,
+                    'name': b.agent.get_full_name(),
+                    'email': b.agent.email
+                }
+                if b.agent else None
+            )
             # Enrich with package specific details if needed (images etc)
             if b.package:
                 b_data['image'] = b.package.featured_image
@@ -72,10 +114,15 @@ def my_packages():
                 b_data['destination'] = f"{b.package.destination_city}, {b.package.destination_country}"
             booked_list.append(b_data)
             
-        saved_list = []
-        user = User.query.get(current_user_id)
-        if user:
-            saved_list = [pkg.to_dict() for pkg in user.favorite_packages.filter_by(is_active=True).all()]
+        # Saved packages straight off the favorites table, no User row needed
+        favorites = User.user_favorites
+        saved_packages = Package.query.join(
+            favorites, favorites.c.package_id == Package.id
+        ).filter(
+            favorites.c.user_id == current_user_id,
+            Package.is_active == True
+        ).all()
+        saved_list = [pkg.to_dict() for pkg in saved_packages]
 
         return APIResponse.success(
             data={
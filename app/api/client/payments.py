@@ -1,14 +1,59 @@
 
-from flask import request, current_app
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from sqlalchemy import and_, desc
+from io import BytesIO
+from functools import lru_cache
+from datetime import datetime, timezone, timedelta
+from flask import request, current_app, send_file
+from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
+from sqlalchemy import and_, case, desc, func, literal
+from sqlalchemy.exc import IntegrityError
+import stripe
 
-from app.models import User, Payment, Booking
-from app.models.enums import PaymentStatus
+from app.extensions import db
+from app.models import Payment, Booking
+from app.models.enums import BookingStatus, PaymentStatus
 from app.utils.api_response import APIResponse
+from app.utils.cache import invoice_pdf_cache
+from app.utils.search_n_filters import SearchHelper
+from app.tasks.background import run_in_background
+from app.tasks.payments import send_payment_confirmation, notify_admin_of_payment
 
 from app.api.client import client_bp
 
+# Metadata keys the history labels read; extracted in SQL so the JSON blob
+# itself is never loaded
+_META_TYPE = Payment.payment_metadata['type'].as_string()
+_META_TIER = Payment.payment_metadata['subscription_tier'].as_string()
+
+# What a payment was for, labelled in the query:
+# "Booking <ref>", "<Tier> Subscription Upgrade", "Subscription Payment" or "Payment"
+_PAYMENT_DESCRIPTION = case(
+    (Booking.id.isnot(None), literal('Booking ').concat(Booking.booking_reference)),
+    (
+        and_(_META_TYPE == 'subscription', func.coalesce(_META_TIER, '') != ''),
+        func.upper(func.substr(_META_TIER, 1, 1))
+        .concat(func.lower(func.substr(_META_TIER, 2)))
+        .concat(' Subscription Upgrade')
+    ),
+    (_META_TYPE == 'subscription', 'Subscription Payment'),
+    else_='Payment'
+)
+
+
+def _payment_history_item(row):
+    """Serialize a payment history row (see get_payments for the columns)"""
+    payment_dict = Payment.row_to_dict(row)
+    payment_dict['description'] = row.description
+    
+    # Enrich with booking info if available
+    if row.booking_reference is not None:
+        payment_dict['booking_reference'] = row.booking_reference
+        payment_dict['booking_type'] = row.booking_type
+    elif row.meta_type == 'subscription':
+        payment_dict['booking_type'] = 'subscription'
+    
+    return payment_dict
+
+
 @client_bp.route('/payments', methods=['GET'])
 @jwt_required()
 def get_payments():
@@ -16,8 +61,9 @@ def get_payments():
     Get user payment history
     
     Query Parameters:
-        page: Page number (default: 1)
-        perPage: Items per page (default: 10)
+        cursor: Opaque cursor from a previous page's nextCursor
+        page: Page number; switches to offset pagination with totals
+        perPage: Items per page (default: 10, max: 100)
         status: Filter by status (paid, pending, failed, refunded)
         fromDate: Filter by date (YYYY-MM-DD)
         toDate: Filter by date (YYYY-MM-DD)
@@ -28,20 +74,48 @@ def get_payments():
     """
     try:
         current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        claims = get_jwt()
         
-        if not user or not user.is_active:
+        if not claims.get('act'):
             return APIResponse.unauthorized('User not found or inactive')
         
         # Get query parameters
         page = int(request.args.get('page', 1))
-        per_page = int(request.args.get('perPage', 10))
+        per_page = min(int(request.args.get('perPage', 10)), 100)
         status = request.args.get('status')
         from_date = request.args.get('fromDate')
         to_date = request.args.get('toDate')
         
-        # Build query
-        query = Payment.query.filter_by(user_id=current_user_id)
+        cursor = None
+        if request.args.get('cursor'):
+            cursor = SearchHelper.decode_cursor(request.args['cursor'])
+            if cursor is None:
+                return APIResponse.validation_error({'cursor': 'Invalid pagination cursor'})
+        
+        # Parse date filters up front so they are compared as timestamps
+        # (a sargable range on created_at) rather than as strings
+        date_errors = {}
+        date_range = {}
+        for field, value in (('fromDate', from_date), ('toDate', to_date)):
+            if value:
+                try:
+                    date_range[field] = datetime.strptime(value, '%Y-%m-%d')
+                except ValueError:
+                    date_errors[field] = 'Invalid date format. Use YYYY-MM-DD'
+        if date_errors:
+            return APIResponse.validation_error(date_errors)
+        
+        # Build query; payment columns plus the booking and description
+        # labels, joined in one round trip
+        query = db.session.query(
+            *Payment.summary_columns(),
+            Booking.booking_reference,
+            Booking.booking_type,
+            _META_TYPE.label('meta_type'),
+            _PAYMENT_DESCRIPTION.label('description')
+        ).outerjoin(
+            Booking, Booking.id == Payment.booking_id
+        ).filter(Payment.user_id == current_user_id)
         
         # Apply filters
         if status and status != 'all':
@@ -52,50 +126,47 @@ def get_payments():
             except ValueError:
                 pass # Ignore invalid status filter
                 
-        if from_date:
-            query = query.filter(Payment.created_at >= from_date)
+        if 'fromDate' in date_range:
+            query = query.filter(Payment.created_at >= date_range['fromDate'])
             
-        if to_date:
-            # Add one day to to_date to include the entire day
-            query = query.filter(Payment.created_at <= to_date + ' 23:59:59')
+        if 'toDate' in date_range:
+            # Everything before the start of the next day includes the entire day
+            query = query.filter(Payment.created_at < date_range['toDate'] + timedelta(days=1))
             
-        # Order by newest first
-        query = query.order_by(desc(Payment.created_at))
-        
-        # Paginate
-        pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+        # Offset pagination (with totals) only when a page number is asked for;
+        # otherwise seek newest first on (created_at, id) without a COUNT
+        if 'page' in request.args:
+            pagination = query.order_by(desc(Payment.created_at)).paginate(
+                page=page, per_page=per_page, error_out=False
+            )
+            page_items = pagination.items
+            pagination_data = {
+                'page': pagination.page,
+                'perPage': pagination.per_page,
+                'totalPages': pagination.pages,
+                'totalItems': pagination.total
+            }
+        else:
+            keyset_page = SearchHelper.keyset_paginate(
+                query, Payment.created_at, Payment.id,
+                cursor=cursor,
+                per_page=per_page
+            )
+            page_items = keyset_page['items']
+            pagination_data = {
+                'perPage': keyset_page['per_page'],
+                'hasNext': keyset_page['has_next'],
+                'hasPrev': keyset_page['has_prev'],
+                'nextCursor': keyset_page['next_cursor']
+            }
         
         # Format response
-        payments_data = []
-        for payment in pagination.items:
-            payment_dict = payment.to_dict()
-            
-            # Enrich with booking info if available
-            if payment.booking:
-                payment_dict['description'] = f"Booking {payment.booking.booking_reference}"
-                payment_dict['booking_reference'] = payment.booking.booking_reference
-                payment_dict['booking_type'] = payment.booking.booking_type
-            else:
-                # Check metadata for subscription info
-                meta = payment.payment_metadata or {}
-                if meta.get('type') == 'subscription':
-                    tier = meta.get('subscription_tier', '')
-                    payment_dict['description'] = f"{tier.title()} Subscription Upgrade" if tier else "Subscription Payment"
-                    payment_dict['booking_type'] = 'subscription'
-                else:
-                    payment_dict['description'] = "Payment"
-                    
-            payments_data.append(payment_dict)
+        payments_data = [_payment_history_item(payment) for payment in page_items]
             
         return APIResponse.success(
             data={
                 'payments': payments_data,
-                'pagination': {
-                    'page': pagination.page,
-                    'perPage': pagination.per_page,
-                    'totalPages': pagination.pages,
-                    'totalItems': pagination.total
-                }
+                'pagination': pagination_data
             },
             message='Payment history retrieved successfully'
         )
@@ -104,6 +175,31 @@ def get_payments():
         current_app.logger.error(f"Get payments error: {str(e)}")
         return APIResponse.error('An error occurred while fetching payment history')
 
+@lru_cache(maxsize=1)
+def _invoice_styles():
+    """
+    Title and table styles shared by every invoice
+    
+    Built once on first use; reportlab stays a lazy import because it is only
+    needed for invoice downloads.
+    """
+    from reportlab.lib import colors
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import TableStyle
+    
+    title_style = getSampleStyleSheet()['Title']
+    table_style = TableStyle([
+        ('BACKGROUND', (0, 0), (0, -1), colors.grey),
+        ('TEXTCOLOR', (0, 0), (0, -1), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ])
+    return title_style, table_style
+
+
 @client_bp.route('/payments/<payment_id>/invoice', methods=['GET'])
 @jwt_required()
 def download_invoice(payment_id):
@@ -112,26 +208,41 @@ def download_invoice(payment_id):
     """
     try:
         current_user_id = get_jwt_identity()
+        claims = get_jwt()
+        
+        if not claims.get('act'):
+            return APIResponse.unauthorized('User not found or inactive')
+        
         payment = Payment.query.filter_by(id=payment_id, user_id=current_user_id).first()
         
         if not payment:
             return APIResponse.not_found('Payment not found')
+        
+        download_name = f"invoice_{payment.payment_reference}.pdf"
+        
+        # Invoice content only changes with the payment status
+        cache_key = (payment.id, payment.status.value)
+        cached_pdf = invoice_pdf_cache.get(cache_key)
+        if cached_pdf is not None:
+            return send_file(
+                BytesIO(cached_pdf),
+                as_attachment=True,
+                download_name=download_name,
+                mimetype='application/pdf'
+            )
             
         # Generate PDF
-        from reportlab.lib import colors
         from reportlab.lib.pagesizes import letter
-        from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-        from io import BytesIO
-        from flask import send_file
+        from reportlab.platypus import SimpleDocTemplate, Table, Paragraph, Spacer
+        
+        title_style, table_style = _invoice_styles()
         
         buffer = BytesIO()
         doc = SimpleDocTemplate(buffer, pagesize=letter)
         elements = []
-        styles = getSampleStyleSheet()
         
         # Header
-        elements.append(Paragraph(f"INVOICE", styles['Title']))
+        elements.append(Paragraph(f"INVOICE", title_style))
         elements.append(Spacer(1, 12))
         
         # content
@@ -141,31 +252,24 @@ def download_invoice(payment_id):
             ["Date", payment.created_at.strftime('%Y-%m-%d %H:%M')],
             ["Amount", f"{payment.currency} {payment.amount}"],
             ["Status", payment.status.value],
-            ["Description", payment.payment_metadata.get('description', 'Payment')]
+            ["Description", (payment.payment_metadata or {}).get('description', 'Payment')]
         ]
         
         if payment.payment_method:
              data.append(["Payment Method", payment.payment_method])
 
         t = Table(data)
-        t.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.grey),
-            ('TEXTCOLOR', (0, 0), (0, -1), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
+        t.setStyle(table_style)
         elements.append(t)
         
         doc.build(elements)
+        invoice_pdf_cache.set(cache_key, buffer.getvalue())
         buffer.seek(0)
         
         return send_file(
             buffer,
             as_attachment=True,
-            download_name=f"invoice_{payment.payment_reference}.pdf",
+            download_name=download_name,
             mimetype='application/pdf'
         )
         
@@ -198,7 +302,7 @@ def create_payment_intent():
             return APIResponse.error(f'Booking is currently {booking.status.value}, not ready for payment')
             
         # 3. Create Intent
-        amount_usd = int(booking.total_price * 100) # Convert to cents
+        amount_usd = booking.total_price_cents
         
         stripe.api_key = current_app.config.get('STRIPE_SECRET_KEY')
         intent = stripe.PaymentIntent.create(
@@ -223,6 +327,16 @@ def create_payment_intent():
         return APIResponse.error(str(e))
 
 
+def _intent_matches_booking(intent, booking):
+    """Check a PaymentIntent was created for this booking and settled its full price in USD"""
+    metadata = intent.metadata or {}
+    return (
+        metadata.get('booking_id') == booking.id
+        and intent.amount_received == booking.total_price_cents
+        and (intent.currency or '').lower() == 'usd'
+    )
+
+
 @client_bp.route('/payments/confirm', methods=['POST'])
 def confirm_payment():
     """
@@ -237,69 +351,82 @@ def confirm_payment():
         if not payment_intent_id or not booking_reference:
             return APIResponse.validation_error('Payment Intent ID and Booking Reference required')
             
-        booking = Booking.query.filter_by(booking_reference=booking_reference).first()
-        if not booking:
+        # Booking and any payment already recorded for this intent on it, in one query
+        row = db.session.query(Booking, Payment.id).outerjoin(
+            Payment, and_(
+                Payment.booking_id == Booking.id,
+                Payment.stripe_payment_intent_id == payment_intent_id
+            )
+        ).filter(Booking.booking_reference == booking_reference).first()
+        if not row:
             return APIResponse.not_found('Booking not found')
+        
+        booking, existing_payment_id = row
+        if existing_payment_id:
+            # Repeat confirmation; nothing to ask Stripe
+            return APIResponse.success(message='Payment already confirmed')
+        
+        if booking.status != BookingStatus.CONFIRMED:
+            return APIResponse.error(f'Booking is currently {booking.status.value}, not awaiting payment')
             
         stripe.api_key = current_app.config.get('STRIPE_SECRET_KEY')
         intent = stripe.PaymentIntent.retrieve(payment_intent_id)
         
         if intent.status == 'succeeded':
-            # 1. Update Booking
-            booking.status = BookingStatus.PAID
+            # Only record intents created for this booking, for its full amount
+            if not _intent_matches_booking(intent, booking):
+                current_app.logger.warning(
+                    f"Payment intent {payment_intent_id} does not match booking {booking.booking_reference}"
+                )
+                return APIResponse.error('Payment does not match this booking')
             
-            # 2. Create Payment Record (if not exists)
-            existing_payment = Payment.query.filter_by(stripe_payment_intent_id=payment_intent_id).first()
-            if not existing_payment:
-                user_id = booking.user_id # We use the booking's user
-                
-                # Try to get card info
-                card_last4 = None
-                card_brand = None
-                if intent.charges.data:
-                    charge = intent.charges.data[0]
-                    payment_method_details = charge.payment_method_details
-                    if payment_method_details.type == 'card':
-                        card_last4 = payment_method_details.card.last4
-                        card_brand = payment_method_details.card.brand
+            # 1. Booking stays CONFIRMED; its amount_paid is kept in step by the
+            # Payment write hooks when the record below is committed
+            
+            # 2. Create Payment Record (once per intent)
+            user_id = booking.user_id # We use the booking's user
+            
+            # Try to get card info
+            card_last4 = None
+            card_brand = None
+            if intent.charges.data:
+                charge = intent.charges.data[0]
+                payment_method_details = charge.payment_method_details
+                if payment_method_details.type == 'card':
+                    card_last4 = payment_method_details.card.last4
+                    card_brand = payment_method_details.card.brand
 
-                payment = Payment(
-                    booking_id=booking.id,
-                    user_id=user_id,
-                    amount=booking.total_price,
-                    currency='USD',
-                    payment_method='stripe',
-                    status=PaymentStatus.PAID,
-                    stripe_payment_intent_id=payment_intent_id,
-                    stripe_charge_id=intent.latest_charge,
-                    card_last4=card_last4,
-                    card_brand=card_brand,
-                    paid_at=datetime.now(timezone.utc),
-                    payment_metadata={
-                        'description': 'Package Booking Payment',
-                        'stripe_status': intent.status
-                    }
-                )
+            payment = Payment(
+                booking_id=booking.id,
+                user_id=user_id,
+                amount=booking.total_price,
+                currency='USD',
+                payment_method='stripe',
+                status=PaymentStatus.PAID,
+                stripe_payment_intent_id=payment_intent_id,
+                stripe_charge_id=intent.latest_charge,
+                card_last4=card_last4,
+                card_brand=card_brand,
+                paid_at=datetime.now(timezone.utc),
+                payment_metadata={
+                    'description': 'Package Booking Payment',
+                    'stripe_status': intent.status
+                }
+            )
+            # ux_payments_stripe_intent rejects a second payment for the same
+            # intent, so a repeated or concurrent confirm cannot double-record
+            try:
                 db.session.add(payment)
                 db.session.commit()
-                
-                # 3. Send Notifications (Dual)
-                user = User.query.get(user_id)
-                NotificationService.send_payment_confirmation(user, payment, booking)
-                
-                # Admin Notification
-                try:
-                    admin_email = current_app.config.get('ADMIN_EMAIL') or 'admin@thrive-travel.com'
-                    admin_msg = f"""
-                    PAYMENT RECEIVED: {booking_reference}
-                    Amount: ${float(payment.amount)}
-                    User: {user.email}
-                    """
-                    EmailService.send_email(admin_email, "Payment Received", admin_msg, html=admin_msg)
-                except:
-                    pass
-                
-                return APIResponse.success(message='Payment confirmed successfully')
+            except IntegrityError:
+                db.session.rollback()
+                return APIResponse.success(message='Payment already confirmed')
+            
+            # 3. Send Notifications (Dual) off the request path
+            run_in_background(send_payment_confirmation, payment.id)
+            run_in_background(notify_admin_of_payment, payment.id)
+            
+            return APIResponse.success(message='Payment confirmed successfully')
         
         return APIResponse.error(f'Payment not successful: {intent.status}')
         
@@ -1,16 +1,138 @@
 
 from flask import request, current_app
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from datetime import datetime, timezone
+from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
+from operator import attrgetter
+import hashlib
+import orjson
+from sqlalchemy import JSON, Text, cast, lambda_stmt, or_, select, true, update
 
 from app.extensions import db
 from app.models import User
+from app.models.enums import UserRole, SubscriptionTier
 from app.api.client.schemas import DashboardSchemas
 from app.utils.api_response import APIResponse
 from app.utils.audit_logging import AuditLogger
+from app.utils.cache import profile_cache, invalidate_user_caches
+from app.utils.serialization import iso_or_none
 
 from app.api.client import client_bp
 
+
+def _json_fragment(value):
+    # Stored JSON text goes into the response as-is, with no dict round trip
+    return orjson.Fragment(value) if value is not None else None
+
+
+# Enum member -> wire value, looked up directly instead of through .value
+_ROLE_VALUES = {member: member.value for member in UserRole}
+_TIER_VALUES = {member: member.value for member in SubscriptionTier}
+
+
+# (response key, User attribute, coercion) for the GET /profile payload
+_PROFILE_FIELDS = (
+    ('id', 'id', None),
+    ('email', 'email', None),
+    ('firstName', 'first_name', None),
+    ('lastName', 'last_name', None),
+    ('phone', 'phone', None),
+    ('dateOfBirth', 'date_of_birth', iso_or_none),
+    ('passportNumber', 'passport_number', None),
+    ('passportExpiry', 'passport_expiry', iso_or_none),
+    ('nationality', 'nationality', None),
+    ('preferredAirline', 'preferred_airline', None),
+    ('frequentFlyerNumbers', 'frequent_flyer_numbers', _json_fragment),
+    ('dietaryPreferences', 'dietary_preferences', None),
+    ('specialAssistance', 'special_assistance', None),
+    ('companyName', 'company_name', None),
+    ('companyTaxId', 'company_tax_id', None),
+    ('billingAddress', 'billing_address', None),
+    ('role', 'role', _ROLE_VALUES.__getitem__),
+    ('subscriptionTier', 'subscription_tier', _TIER_VALUES.__getitem__),
+    ('referralCode', 'referral_code', None),
+    ('referralCredits', 'referral_credits', float),
+    ('emailVerified', 'email_verified', None),
+    ('createdAt', 'created_at', iso_or_none),
+    ('lastLogin', 'last_login', iso_or_none),
+)
+_PROFILE_GETTER = attrgetter(*(attr for _, attr, _ in _PROFILE_FIELDS))
+_PROFILE_CONVERTERS = tuple((key, convert) for key, _, convert in _PROFILE_FIELDS)
+
+
+# JSON columns are read back as their stored text (see _json_fragment)
+# updated_at is not serialized; it stamps the cached payload (see get_profile)
+_PROFILE_SELECT = tuple(
+    cast(column, Text).label(column.key) if isinstance(column.type, JSON) else column
+    for column in User.profile_columns()
+) + (User.updated_at,)
+
+# Columns a client may write through PUT /profile; role, tier, credits etc. are never client-set
+_UPDATABLE_FIELDS = frozenset((
+    'first_name', 'last_name', 'phone', 'date_of_birth', 'passport_number',
+    'passport_expiry', 'nationality', 'preferred_airline', 'frequent_flyer_numbers',
+    'dietary_preferences', 'special_assistance', 'company_name', 'company_tax_id',
+    'billing_address'
+))
+
+
+def _profile_statement(user_id):
+    """
+    Profile row lookup as a lambda statement
+
+    The lambda's code is analysed once and its compiled SQL is reused; later
+    calls only extract user_id as the bound parameter.
+    """
+    return lambda_stmt(
+        lambda: select(*_PROFILE_SELECT).where(User.id == user_id)
+    )
+
+
+def _serialize_profile(row):
+    """Build the profile payload with one attribute walk over a user row"""
+    return {
+        key: convert(value) if convert else value
+        for (key, convert), value in zip(_PROFILE_CONVERTERS, _PROFILE_GETTER(row))
+    }
+
+
+def _has_changes(cleaned_data):
+    """
+    SQL predicate that is true when any submitted value differs from the row
+
+    JSON columns have no equality operator on PostgreSQL, so submitting one
+    always counts as a change.
+    """
+    if any(isinstance(getattr(User, field).type, JSON) for field in cleaned_data):
+        return true()
+    return or_(*(getattr(User, field).is_distinct_from(value) for field, value in cleaned_data.items()))
+
+
+def _update_response_profile(row):
+    return {
+        'id': row.id,
+        'firstName': row.first_name,
+        'lastName': row.last_name,
+        'phone': row.phone
+    }
+
+
+def _profile_stamp_statement(user_id):
+    return lambda_stmt(
+        lambda: select(User.updated_at).where(User.id == user_id)
+    )
+
+
+def _load_profile(user_id):
+    """Fetch a user's profile payload, ETag and updated_at, or None if the user is gone"""
+    # Plain column projection: no ORM instance, identity map or lazy loaders
+    row = db.session.execute(_profile_statement(user_id)).first()
+    if row is None:
+        return None
+    
+    profile_data = _serialize_profile(row)
+    etag = hashlib.blake2b(orjson.dumps(profile_data, option=orjson.OPT_SORT_KEYS), digest_size=16).hexdigest()
+    return profile_data, etag, row.updated_at
+
+
 @client_bp.route('/profile', methods=['GET'])
 @jwt_required()
 def get_profile():
@@ -19,49 +141,46 @@ def get_profile():
     
     Returns:
         200: User profile data
+        304: Profile unchanged since the ETag in If-None-Match
         401: Unauthorized
     """
-    try:
-        current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
-        
-        if not user or not user.is_active:
-            return APIResponse.unauthorized('User not found or inactive')
-        
-        profile_data = {
-            'id': user.id,
-            'email': user.email,
-            'firstName': user.first_name,
-            'lastName': user.last_name,
-            'phone': user.phone,
-            'dateOfBirth': user.date_of_birth.isoformat() if user.date_of_birth else None,
-            'passportNumber': user.passport_number,
-            'passportExpiry': user.passport_expiry.isoformat() if user.passport_expiry else None,
-            'nationality': user.nationality,
-            'preferredAirline': user.preferred_airline,
-            'frequentFlyerNumbers': user.frequent_flyer_numbers,
-            'dietaryPreferences': user.dietary_preferences,
-            'specialAssistance': user.special_assistance,
-            'companyName': user.company_name,
-            'companyTaxId': user.company_tax_id,
-            'billingAddress': user.billing_address,
-            'role': user.role.value,
-            'subscriptionTier': user.subscription_tier.value,
-            'referralCode': user.referral_code,
-            'referralCredits': float(user.referral_credits),
-            'emailVerified': user.email_verified,
-            'createdAt': user.created_at.isoformat(),
-            'lastLogin': user.last_login.isoformat() if user.last_login else None
-        }
-        
-        return APIResponse.success(
+    current_user_id = get_jwt_identity()
+    claims = get_jwt()
+    
+    if not claims.get('act'):
+        return APIResponse.unauthorized('User not found or inactive')
+    
+    # Committed writes in this worker drop the entry (see register_cache_invalidation).
+    # Writes from other workers bump the DB-stamped updated_at, so a cached payload
+    # is only served while its stamp still matches the row.
+    cached = profile_cache.get(current_user_id)
+    if cached is not None:
+        stamp_row = db.session.execute(_profile_stamp_statement(current_user_id)).first()
+        if stamp_row is None or stamp_row.updated_at != cached[2]:
+            profile_cache.delete(current_user_id)
+            cached = None
+    
+    if cached is None:
+        # Concurrent misses for the same user share a single lookup
+        cached = profile_cache.get_or_set(current_user_id, lambda: _load_profile(current_user_id))
+    
+    if cached is None:
+        return APIResponse.unauthorized('User not found or inactive')
+    
+    profile_data, etag, _ = cached
+    
+    # Clients polling an unchanged profile get an empty 304
+    if request.if_none_match.contains(etag):
+        response = current_app.response_class(status=304)
+    else:
+        response, _ = APIResponse.success(
             data={'profile': profile_data},
             message='Profile retrieved successfully'
         )
-        
-    except Exception as e:
-        current_app.logger.error(f"Get profile error: {str(e)}")
-        return APIResponse.error('An error occurred while fetching profile data')
+    
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
 
 
 @client_bp.route('/profile', methods=['PUT'])
@@ -75,49 +194,73 @@ def update_profile():
         400: Validation error
         401: Unauthorized
     """
-    try:
-        current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
-        
-        if not user or not user.is_active:
-            return APIResponse.unauthorized('User not found or inactive')
-        
-        data = request.get_json()
-        
-        # Validate input
-        is_valid, errors, cleaned_data = DashboardSchemas.validate_profile_update(data)
-        if not is_valid:
-            return APIResponse.validation_error(errors)
-        
-        # Update user fields
-        for field, value in cleaned_data.items():
-            setattr(user, field, value)
-        
-        user.updated_at = datetime.now(timezone.utc)
-        db.session.commit()
-        
-        # Log profile update
-        AuditLogger.log_action(
-            user_id=user.id,
-            action='profile_updated',
-            entity_type='user',
-            entity_id=user.id,
-            description='User profile updated',
-            ip_address=request.remote_addr,
-            user_agent=request.headers.get('User-Agent')
+    current_user_id = get_jwt_identity()
+    claims = get_jwt()
+    
+    if not claims.get('act'):
+        return APIResponse.unauthorized('User not found or inactive')
+    
+    ip_address, user_agent = AuditLogger.request_origin()
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return APIResponse.error('Request body must be a JSON object')
+    
+    # Validate input
+    is_valid, errors, cleaned_data = DashboardSchemas.validate_profile_update(data)
+    if not is_valid:
+        return APIResponse.validation_error(errors)
+    
+    # cleaned_data is splatted into the UPDATE, so refuse anything outside the whitelist
+    if not cleaned_data.keys() <= _UPDATABLE_FIELDS:
+        return APIResponse.validation_error(
+            {field: 'Field cannot be updated' for field in cleaned_data.keys() - _UPDATABLE_FIELDS}
         )
+    
+    response_columns = (User.id, User.first_name, User.last_name, User.phone)
+    
+    # Write straight to the row and read back only what the response needs;
+    # is_active is re-checked here so a deactivation after token issue still blocks the write.
+    # The change predicate makes a resubmitted, identical profile match no row.
+    row = None
+    if cleaned_data:
+        row = db.session.execute(
+            update(User)
+            .where(User.id == current_user_id, User.is_active == True, _has_changes(cleaned_data))
+            .values(**cleaned_data)
+            .returning(*response_columns)
+        ).first()
+    
+    if row is None:
+        # Nothing to write, nothing changed, or the user is gone/inactive
+        db.session.rollback()
+        row = db.session.execute(
+            select(*response_columns).where(User.id == current_user_id, User.is_active == True)
+        ).first()
+        if row is None:
+            return APIResponse.unauthorized('User not found or inactive')
         
         return APIResponse.success(
-            data={'profile': {
-                'id': user.id,
-                'firstName': user.first_name,
-                'lastName': user.last_name,
-                'phone': user.phone
-            }},
-            message='Profile updated successfully'
+            data={'profile': _update_response_profile(row)},
+            message='Profile is already up to date'
         )
-        
-    except Exception as e:
-        db.session.rollback()
-        current_app.logger.error(f"Update profile error: {str(e)}")
-        return APIResponse.error('An error occurred while updating profile')
+    
+    db.session.commit()
+    # Bulk UPDATEs skip mapper events, so drop cached payloads here
+    invalidate_user_caches(row.id)
+    
+    # Audit entry is batched and written off the request path
+    AuditLogger.enqueue(
+        user_id=row.id,
+        action='profile_updated',
+        entity_type='user',
+        entity_id=row.id,
+        description='User profile updated',
+        changes={'fields': sorted(cleaned_data)},
+        ip_address=ip_address,
+        user_agent=user_agent
+    )
+    
+    return APIResponse.success(
+        data={'profile': _update_response_profile(row)},
+        message='Profile updated successfully'
+    )
@@ -5,6 +5,7 @@ Provides comprehensive validation for all dashboard endpoints
 import re
 from typing import Optional, Dict, Any, Tuple, List
 from datetime import datetime, date
+from app.utils.search_n_filters import SearchHelper
 
 
 class DashboardSchemas:
@@ -278,6 +279,19 @@ class DashboardSchemas:
         except (ValueError, TypeError):
             errors['perPage'] = 'Per page must be a valid integer'
         
+        # Keyset pagination cursor
+        cursor = data.get('cursor', '')
+        if cursor:
+            decoded_cursor = SearchHelper.decode_cursor(cursor)
+            if decoded_cursor is None:
+                errors['cursor'] = 'Invalid pagination cursor'
+            else:
+                cleaned_data['cursor'] = decoded_cursor
+        
+        # Opt-in to offset pagination with total counts
+        include_total = str(data.get('includeTotal', '')).strip().lower()
+        cleaned_data['include_total'] = include_total in ('1', 'true', 'yes')
+        
         is_valid = len(errors) == 0
         return is_valid, errors if not is_valid else None, cleaned_data if is_valid else None
     
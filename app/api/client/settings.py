@@ -1,6 +1,7 @@
 
 from flask import request, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy.orm import load_only
 
 from app.extensions import db
 from app.models import User
@@ -22,7 +23,10 @@ def get_settings():
     """
     try:
         current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        user = db.session.get(
+            User, current_user_id,
+            options=[load_only(User.id, User.is_active, User.custom_settings)]
+        )
         
         if not user or not user.is_active:
             return APIResponse.unauthorized('User not found or inactive')
@@ -57,7 +61,10 @@ def update_settings():
     """
     try:
         current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        user = db.session.get(
+            User, current_user_id,
+            options=[load_only(User.id, User.is_active, User.custom_settings)]
+        )
         
         if not user or not user.is_active:
             return APIResponse.unauthorized('User not found or inactive')
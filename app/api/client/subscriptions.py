@@ -3,19 +3,82 @@ from flask import request, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
+import orjson
 import stripe
+from sqlalchemy.orm import load_only
 
 from app.extensions import db
 from app.models import User, Payment
 from app.models.enums import PaymentStatus, SubscriptionTier
 from app.api.client.schemas import DashboardSchemas
 from app.utils.api_response import APIResponse
-from app.utils.email import EmailService
 from app.utils.audit_logging import AuditLogger
-from app.services.notification import NotificationService
+from app.tasks.background import run_in_background
+from app.tasks.subscriptions import (
+    send_subscription_email,
+    create_subscription_notification,
+    audit_subscription_upgrade
+)
 
 from app.api.client import client_bp
 
+# Subscription tiers with pricing and benefits
+_SUBSCRIPTION_TIERS = {
+    'bronze': {
+        'name': 'Bronze',
+        'price': 29.99,
+        'currency': 'USD',
+        'interval': 'month',
+        'maxBookings': 6,
+        'benefits': [
+            '6 bookings per month',
+            'Basic customer support',
+            '5% discount on all bookings',
+            'Email notifications'
+        ]
+    },
+    'silver': {
+        'name': 'Silver',
+        'price': 59.99,
+        'currency': 'USD',
+        'interval': 'month',
+        'maxBookings': 15,
+        'benefits': [
+            '15 bookings per month',
+            'Priority customer support',
+            '10% discount on all bookings',
+            'SMS & Email notifications',
+            'Free cancellation (up to 24h)'
+        ]
+    },
+    'gold': {
+        'name': 'Gold',
+        'price': 99.99,
+        'currency': 'USD',
+        'interval': 'month',
+        'maxBookings': -1,  # Unlimited
+        'benefits': [
+            'Unlimited bookings',
+            '24/7 VIP customer support',
+            '15% discount on all bookings',
+            'SMS & Email notifications',
+            'Free cancellation anytime',
+            'Dedicated travel agent',
+            'Exclusive deals and offers'
+        ]
+    }
+}
+
+# Static tier listing, serialized once and embedded as-is in responses
+_SUBSCRIPTION_TIERS_JSON = orjson.Fragment(orjson.dumps(_SUBSCRIPTION_TIERS, option=orjson.OPT_SORT_KEYS))
+
+# Tier pricing in cents
+_TIER_PRICING = {
+    'bronze': 2999,  # $29.99 in cents
+    'silver': 5999,  # $59.99 in cents
+    'gold': 9999     # $99.99 in cents
+}
+
 @client_bp.route('/subscriptions', methods=['GET'])
 @jwt_required()
 def get_subscriptions():
@@ -28,71 +91,24 @@ def get_subscriptions():
     """
     try:
         current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        user = db.session.get(User, current_user_id, options=[load_only(*User.subscription_columns())])
         
         if not user or not user.is_active:
             return APIResponse.unauthorized('User not found or inactive')
         
-        # Define subscription tiers with pricing and benefits
-        subscription_tiers = {
-            'bronze': {
-                'name': 'Bronze',
-                'price': 29.99,
-                'currency': 'USD',
-                'interval': 'month',
-                'maxBookings': 6,
-                'benefits': [
-                    '6 bookings per month',
-                    'Basic customer support',
-                    '5% discount on all bookings',
-                    'Email notifications'
-                ]
-            },
-            'silver': {
-                'name': 'Silver',
-                'price': 59.99,
-                'currency': 'USD',
-                'interval': 'month',
-                'maxBookings': 15,
-                'benefits': [
-                    '15 bookings per month',
-                    'Priority customer support',
-                    '10% discount on all bookings',
-                    'SMS & Email notifications',
-                    'Free cancellation (up to 24h)'
-                ]
-            },
-            'gold': {
-                'name': 'Gold',
-                'price': 99.99,
-                'currency': 'USD',
-                'interval': 'month',
-                'maxBookings': -1,  # Unlimited
-                'benefits': [
-                    'Unlimited bookings',
-                    '24/7 VIP customer support',
-                    '15% discount on all bookings',
-                    'SMS & Email notifications',
-                    'Free cancellation anytime',
-                    'Dedicated travel agent',
-                    'Exclusive deals and offers'
-                ]
-            }
-        }
-        
         current_subscription = {
             'tier': user.subscription_tier.value,
             'startDate': user.subscription_start.isoformat() if user.subscription_start else None,
             'endDate': user.subscription_end.isoformat() if user.subscription_end else None,
             'isActive': user.has_active_subscription(),
             'bookingsUsed': user.monthly_bookings_used,
-            'bookingsRemaining': subscription_tiers.get(user.subscription_tier.value, {}).get('maxBookings', 0) - user.monthly_bookings_used if user.subscription_tier.value != 'none' else 0
+            'bookingsRemaining': _SUBSCRIPTION_TIERS.get(user.subscription_tier.value, {}).get('maxBookings', 0) - user.monthly_bookings_used if user.subscription_tier.value != 'none' else 0
         }
         
         return APIResponse.success(
             data={
                 'currentSubscription': current_subscription,
-                'availableTiers': subscription_tiers
+                'availableTiers': _SUBSCRIPTION_TIERS_JSON
             },
             message='Subscription information retrieved successfully'
         )
@@ -110,11 +126,12 @@ def upgrade_subscription():
     """
     try:
         current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        user = db.session.get(User, current_user_id, options=[load_only(*User.subscription_columns())])
         
         if not user or not user.is_active:
             return APIResponse.unauthorized('User not found or inactive')
         
+        ip_address, user_agent = AuditLogger.request_origin()
         data = request.get_json()
         
         # Validate input
@@ -125,14 +142,7 @@ def upgrade_subscription():
         tier = cleaned_data['tier']
         payment_method_id = cleaned_data.get('payment_method_id')
         
-        # Define pricing
-        tier_pricing = {
-            'bronze': 2999,  # $29.99 in cents
-            'silver': 5999,  # $59.99 in cents
-            'gold': 9999     # $99.99 in cents
-        }
-        
-        amount = tier_pricing.get(tier)
+        amount = _TIER_PRICING.get(tier)
         if not amount:
             return APIResponse.error('Invalid subscription tier')
         
@@ -211,34 +221,14 @@ def upgrade_subscription():
                 db.session.add(payment)
                 db.session.commit()
                 
-                # Send confirmation email
-                try:
-                    EmailService.send_email(
-                        to=user.email,
-                        subject=f'Subscription Upgraded to {tier.upper()}',
-                        body=f"""
-                        Hello {user.first_name},
-                        
-                        Your subscription has been successfully upgraded to {tier.upper()}!
-                        
-                        Your new subscription is active and will renew on {user.subscription_end.strftime('%B %d, %Y')}.
-                        
-                        Thank you for choosing Thrive Travel!
-                        """
-                    )
-                except Exception as e:
-                    current_app.logger.error(f"Failed to send subscription email: {str(e)}")
-                
-                # Create notification
-                try:
-                    NotificationService.create_notification(
-                        user_id=user.id,
-                        notification_type='subscription_upgraded',
-                        title='Subscription Upgraded!',
-                        message=f'Your subscription has been upgraded to {tier.upper()}. Enjoy your new benefits!'
-                    )
-                except Exception as e:
-                    current_app.logger.error(f"Failed to create notification: {str(e)}")
+                # Email and notification run off the request path; the audit entry is batched
+                run_in_background(send_subscription_email, user.id, tier)
+                run_in_background(create_subscription_notification, user.id, tier)
+                audit_subscription_upgrade(
+                    user.id, payment.id, tier,
+                    ip_address=ip_address,
+                    user_agent=user_agent
+                )
                 
                 return APIResponse.success(
                     data={
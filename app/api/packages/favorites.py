@@ -1,5 +1,6 @@
 from flask import current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy.orm import selectinload
 
 from app.api.packages import packages_bp
 from app.models import User
@@ -18,12 +19,14 @@ def get_user_favorites():
     """
     try:
         current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        user = User.query.options(
+            selectinload(User.active_favorite_packages)
+        ).filter_by(id=current_user_id).first()
 
         if not user:
              return APIResponse.error("User not found", status_code=404)
 
-        favorites = user.favorite_packages.filter_by(is_active=True).all()
+        favorites = user.active_favorite_packages
         
         return APIResponse.success(
             data=[pkg.to_dict() for pkg in favorites],
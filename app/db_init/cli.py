@@ -9,7 +9,11 @@ from flask.cli import with_appcontext
 from app.db_init import init_database, clear_database
 from app.db_init.init_db import reset_database
 from app.db_init.sample_packages import SAMPLE_PACKAGES
+from sqlalchemy import inspect, text
 from app.models.package import Package
+from app.models.booking import Booking
+from app.models.payment import Payment
+from app.extensions import db
 
 @click.group()
 def db_commands():
@@ -73,4 +77,73 @@ def load_packages_command(clear):
     else:
         click.echo(f'⚠️ Loaded {success} packages with {errors} errors.')
         for error in error_list:
-            click.echo(f'  ❌ {error}')
\ No newline at end of file
+            click.echo(f'  ❌ {error}')
+
+@db_commands.command('sync-amount-paid')
+@with_appcontext
+def sync_amount_paid_command():
+    '''Recompute every booking's amount_paid from its PAID payments.'''
+    try:
+        result = Payment.sync_booking_amount_paid(db.session.connection())
+        db.session.commit()
+        click.echo(f'✅ Synced amount paid for {result.rowcount} bookings!')
+    except Exception as e:
+        db.session.rollback()
+        click.echo(f'❌ Error syncing amount paid: {str(e)}', err=True)
+        raise
+
+def add_missing_schema(connection):
+    """
+    Add columns and indexes that create_all will not add to an existing database
+    
+    Returns the names of the objects that were created.
+    """
+    inspector = inspect(connection)
+    applied = []
+    booking_columns = {column['name'] for column in inspector.get_columns('bookings')}
+    
+    # Booking.amount_paid: NOT NULL, so it needs a default for the existing rows;
+    # the real totals are then recomputed from the PAID payments
+    if 'amount_paid' not in booking_columns:
+        connection.execute(text(
+            "ALTER TABLE bookings ADD COLUMN amount_paid NUMERIC(10, 2) NOT NULL DEFAULT 0"
+        ))
+        Payment.sync_booking_amount_paid(connection)
+        applied.append('bookings.amount_paid')
+    
+    # Booking.total_price_cents: generated from total_price. SQLite can only add
+    # generated columns as VIRTUAL; PostgreSQL stores it (this rewrites the table).
+    if 'total_price_cents' not in booking_columns:
+        expression = Booking.__table__.c.total_price_cents.computed.sqltext
+        storage = 'VIRTUAL' if connection.dialect.name == 'sqlite' else 'STORED'
+        connection.execute(text(
+            f"ALTER TABLE bookings ADD COLUMN total_price_cents BIGINT "
+            f"GENERATED ALWAYS AS ({expression}) {storage}"
+        ))
+        applied.append('bookings.total_price_cents')
+    
+    # Payment confirmation relies on this unique index for idempotency; it fails
+    # to build while duplicate stripe_payment_intent_id rows exist
+    existing_indexes = {index['name'] for index in inspector.get_indexes('payments')}
+    for index in Payment.__table__.indexes:
+        if index.name == 'ux_payments_stripe_intent' and index.name not in existing_indexes:
+            index.create(connection)
+            applied.append(index.name)
+    
+    return applied
+
+@db_commands.command('sync-schema')
+@with_appcontext
+def sync_schema_command():
+    '''Add the amount_paid and total_price_cents columns and ux_payments_stripe_intent index to an existing database.'''
+    try:
+        applied = add_missing_schema(db.session.connection())
+        db.session.commit()
+        if applied:
+            click.echo(f'✅ Added {", ".join(applied)}')
+        else:
+            click.echo('✅ Schema already up to date')
+    except Exception as e:
+        db.session.rollback()
+        click.echo(f'❌ Error syncing schema: {str(e)}', err=True)
+        raise
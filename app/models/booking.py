@@ -3,11 +3,42 @@ from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime, timedelta, timezone
 import uuid
 from decimal import Decimal
+from operator import attrgetter
 from app.extensions import db
 from app.models.enums import BookingStatus, TripType, TravelClass
+from app.utils.serialization import enum_value, iso_or_none
+
+
+def _price_or_zero(value):
+    return float(value) if value is not None else 0.0
+
+
+# Converters for the SUMMARY_COLUMNS that are not emitted as-is
+_SUMMARY_CONVERTERS = {
+    'status': enum_value,
+    'trip_type': enum_value,
+    'departure_date': iso_or_none,
+    'return_date': iso_or_none,
+    'total_price': _price_or_zero,
+    'created_at': iso_or_none,
+}
 
 class Booking(db.Model):
     __tablename__ = 'bookings'
+    __table_args__ = (
+        # Per-user listings ordered newest first (also backs keyset pagination)
+        db.Index('ix_bookings_user_created', 'user_id', 'created_at'),
+        # Covers the dashboard stats roll-up (every column it reads)
+        db.Index('ix_bookings_user_stats', 'user_id', 'status', 'booking_type', 'departure_date'),
+        # Per-type listings and counts (flights page)
+        db.Index('ix_bookings_user_type_status', 'user_id', 'booking_type', 'status'),
+        # Upcoming trips by type; only open bookings are ever queried by date
+        db.Index(
+            'ix_bookings_user_type_depart', 'user_id', 'booking_type', 'departure_date',
+            postgresql_where=db.text("status IN ('CONFIRMED', 'PENDING')"),
+            sqlite_where=db.text("status IN ('CONFIRMED', 'PENDING')")
+        ),
+    )
     
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     booking_reference = db.Column(db.String(20), unique=True, nullable=False, index=True)
@@ -44,6 +75,15 @@ class Booking(db.Model):
     taxes = db.Column(db.Numeric(10, 2), default=0.00)
     discount = db.Column(db.Numeric(10, 2), default=0.00)
     total_price = db.Column(db.Numeric(10, 2), nullable=False)
+    # total_price in integer cents, generated by the database (Stripe amounts).
+    # create_all does not add it to existing databases: run 'flask db-manage sync-schema'
+    total_price_cents = db.Column(
+        db.BigInteger,
+        db.Computed('CAST(ROUND(total_price * 100) AS BIGINT)', persisted=True)
+    )
+    # Sum of PAID payments; kept in sync by Payment write hooks. Existing
+    # databases get it from 'flask db-manage sync-schema'
+    amount_paid = db.Column(db.Numeric(10, 2), default=0.00, nullable=False)
     
     # Additional details
     is_urgent = db.Column(db.Boolean, default=False)
@@ -68,6 +108,14 @@ class Booking(db.Model):
     payments = db.relationship('Payment', backref='booking', lazy='dynamic', cascade='all, delete-orphan')
     agent = db.relationship('User', foreign_keys=[assigned_agent_id], backref='handled_bookings')
     
+    # Columns read by to_summary_dict
+    SUMMARY_COLUMNS = (
+        'id', 'booking_reference', 'booking_type', 'status', 'trip_type',
+        'origin', 'destination', 'departure_date', 'return_date',
+        'num_adults', 'num_children', 'num_infants',
+        'package_id', 'total_price', 'created_at'
+    )
+    
     def __init__(self, **kwargs):
         super(Booking, self).__init__(**kwargs)
         if not self.booking_reference:
@@ -91,76 +139,91 @@ class Booking(db.Model):
     def get_total_passengers(self):
         return self.num_adults + self.num_children + self.num_infants
     
-    def to_dict(self, include_relations: bool = True):
+    @classmethod
+    def row_columns(cls):
+        """Every mapped column, for plain row queries serialized with row_to_dict"""
+        return list(cls.__table__.columns)
+    
+    @staticmethod
+    def row_to_dict(row):
         """
-        Serialize Booking model to dictionary for API responses.
+        Serialize a booking's own columns.
 
-        Args:
-            include_relations (bool): Whether to include passengers, payments, agent info
-
-        Returns:
-            dict
+        Accepts a Booking instance or a row selected with row_columns(), so list
+        views can skip ORM hydration and still return the to_dict() payload.
         """
-
-        data = {
+        return {
             # Identifiers
-            "id": self.id,
-            "booking_reference": self.booking_reference,
+            "id": row.id,
+            "booking_reference": row.booking_reference,
 
             # Ownership
-            "user_id": self.user_id,
-            "assigned_agent_id": self.assigned_agent_id,
+            "user_id": row.user_id,
+            "assigned_agent_id": row.assigned_agent_id,
 
             # Booking meta
-            "booking_type": self.booking_type,
-            "status": self.status.value if self.status else None,
-            "is_urgent": self.is_urgent,
+            "booking_type": row.booking_type,
+            "status": row.status.value if row.status else None,
+            "is_urgent": row.is_urgent,
 
             # Trip details
-            "trip_type": self.trip_type.value if self.trip_type else None,
-            "origin": self.origin,
-            "destination": self.destination,
-            "departure_date": self.departure_date.isoformat() if self.departure_date else None,
-            "return_date": self.return_date.isoformat() if self.return_date else None,
+            "trip_type": row.trip_type.value if row.trip_type else None,
+            "origin": row.origin,
+            "destination": row.destination,
+            "departure_date": row.departure_date.isoformat() if row.departure_date else None,
+            "return_date": row.return_date.isoformat() if row.return_date else None,
 
             # Flight-specific
-            "airline": self.airline,
-            "flight_number": self.flight_number,
-            "travel_class": self.travel_class.value if self.travel_class else None,
-            "num_adults": self.num_adults,
-            "num_children": self.num_children,
-            "num_infants": self.num_infants,
-            "total_passengers": self.get_total_passengers(),
+            "airline": row.airline,
+            "flight_number": row.flight_number,
+            "travel_class": row.travel_class.value if row.travel_class else None,
+            "num_adults": row.num_adults,
+            "num_children": row.num_children,
+            "num_infants": row.num_infants,
+            "total_passengers": row.num_adults + row.num_children + row.num_infants,
 
             # Amadeus / GDS raw data
-            "flight_offer": self.flight_offer,
+            "flight_offer": row.flight_offer,
 
             # Package
-            "package_id": self.package_id,
+            "package_id": row.package_id,
 
             # Pricing (Decimal → float for JSON)
             
-            "base_price": float(self.base_price) if self.base_price is not None else 0.0,
-            "service_fee": float(self.service_fee) if self.service_fee is not None else 0.0,
-            "taxes": float(self.taxes) if self.taxes is not None else 0.0,
-            "discount": float(self.discount) if self.discount is not None else 0.0,
-            "total_price": float(self.total_price) if self.total_price is not None else 0.0,
+            "base_price": float(row.base_price) if row.base_price is not None else 0.0,
+            "service_fee": float(row.service_fee) if row.service_fee is not None else 0.0,
+            "taxes": float(row.taxes) if row.taxes is not None else 0.0,
+            "discount": float(row.discount) if row.discount is not None else 0.0,
+            "total_price": float(row.total_price) if row.total_price is not None else 0.0,
             
 
             # Notes & extras
-            "special_requests": self.special_requests,
-            "notes": self.notes,
+            "special_requests": row.special_requests,
+            "notes": row.notes,
 
             # Confirmations
-            "airline_confirmation": self.airline_confirmation,
-            "ticket_numbers": self.ticket_numbers or [],
+            "airline_confirmation": row.airline_confirmation,
+            "ticket_numbers": row.ticket_numbers or [],
 
             # Lifecycle timestamps
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
-            "confirmed_at": self.confirmed_at.isoformat() if self.confirmed_at else None,
-            "cancelled_at": self.cancelled_at.isoformat() if self.cancelled_at else None,
+            "created_at": row.created_at.isoformat() if row.created_at else None,
+            "updated_at": row.updated_at.isoformat() if row.updated_at else None,
+            "confirmed_at": row.confirmed_at.isoformat() if row.confirmed_at else None,
+            "cancelled_at": row.cancelled_at.isoformat() if row.cancelled_at else None,
         }
+    
+    def to_dict(self, include_relations: bool = True):
+        """
+        Serialize Booking model to dictionary for API responses.
+
+        Args:
+            include_relations (bool): Whether to include passengers, payments, agent info
+
+        Returns:
+            dict
+        """
+
+        data = Booking.row_to_dict(self)
 
         if include_relations:
             data["passengers"] = [
@@ -174,13 +237,41 @@ class Booking(db.Model):
             data["agent"] = (
                 {
                     "id": self.agent.id,
-                    "name": self.agent.full_name if hasattr(self.agent, "full_name") else None,
+                    "name": self.agent.get_full_name(),
                     "email": self.agent.email
                 }
                 if self.agent else None
             )
 
         return data
+    
+    @classmethod
+    def summary_columns(cls):
+        """Column attributes read by to_summary_dict, for use with load_only()"""
+        return [getattr(cls, name) for name in cls.SUMMARY_COLUMNS]
+    
+    def to_summary_dict(self):
+        """
+        Lightweight serialization for list views.
+        
+        Only touches SUMMARY_COLUMNS, so it is safe on rows loaded with
+        load_only(*Booking.summary_columns()). The columns are fetched with a
+        single attrgetter call and converted through a precomputed table.
+        """
+        summary = {
+            name: convert(value) if convert else value
+            for (name, convert), value in zip(_SUMMARY_FIELDS, _SUMMARY_GETTER(self))
+        }
+        summary["total_passengers"] = (
+            summary["num_adults"] + summary["num_children"] + summary["num_infants"]
+        )
+        return summary
+
+
+# Field table for to_summary_dict, built once from SUMMARY_COLUMNS
+_SUMMARY_GETTER = attrgetter(*Booking.SUMMARY_COLUMNS)
+_SUMMARY_FIELDS = tuple((name, _SUMMARY_CONVERTERS.get(name)) for name in Booking.SUMMARY_COLUMNS)
+
 # def to_dict(self): 
 #   return { 
 #       'id': self.id, 
@@ -4,6 +4,12 @@ from app.extensions import db
 
 class Notification(db.Model):
     __tablename__ = 'notifications'
+    __table_args__ = (
+        # Booking activity log, newest first
+        db.Index('ix_notifications_booking_created', 'booking_id', 'created_at'),
+        # Per-user feed (optionally unread only), newest first
+        db.Index('ix_notifications_user_read_created', 'user_id', 'is_read', 'created_at'),
+    )
     
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False, index=True)
@@ -2,6 +2,7 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_login import UserMixin
 from datetime import datetime, timezone, date
 import uuid
+from sqlalchemy import DDL, event, literal_column
 from app.extensions import db
 from slugify import slugify  # pip install python-slugify
 
@@ -107,6 +108,12 @@ class Package(db.Model):
             'updated_at': self.updated_at
         }
     
+    @classmethod
+    def search_document(cls):
+        """Name, city and country as one searchable string (see ix_packages_search_trgm)"""
+        separator = literal_column("' '")
+        return cls.name.concat(separator).concat(cls.destination_city).concat(separator).concat(cls.destination_country)
+    
     @staticmethod
     def load_packages(packages_data, clear_existing=False):
         """
@@ -181,4 +188,18 @@ class Package(db.Model):
             db.session.rollback()
             error_msg = f"Critical error during package loading: {str(e)}"
             print(f"✗ {error_msg}")
-            return success_count, error_count, [error_msg]
\ No newline at end of file
+            return success_count, error_count, [error_msg]
+
+# Trigram index so substring search on the search document is an index lookup
+# on PostgreSQL; other databases keep scanning
+event.listen(
+    Package.__table__,
+    'before_create',
+    DDL('CREATE EXTENSION IF NOT EXISTS pg_trgm').execute_if(dialect='postgresql')
+)
+db.Index(
+    'ix_packages_search_trgm',
+    Package.search_document().label('search_document'),
+    postgresql_using='gin',
+    postgresql_ops={'search_document': 'gin_trgm_ops'}
+).ddl_if(dialect='postgresql')
@@ -1,11 +1,27 @@
 from datetime import datetime, timezone
 import uuid
 from decimal import Decimal
+from sqlalchemy import event, func, inspect, select
 from app.extensions import db
 from app.models.enums import PaymentStatus
 
 class Payment(db.Model):
     __tablename__ = 'payments'
+    __table_args__ = (
+        # Latest payment per booking
+        db.Index('ix_payments_booking_created', 'booking_id', 'created_at'),
+        # Per-user spending roll-ups (dashboard total and monthly chart)
+        db.Index('ix_payments_user_status_paid', 'user_id', 'status', 'paid_at', 'amount'),
+        # Payment history, newest first (keyset pagination)
+        db.Index('ix_payments_user_created', 'user_id', 'created_at', 'id'),
+        # One payment per Stripe intent; confirm relies on it for idempotency.
+        # Existing databases get it from 'flask db-manage sync-schema'
+        db.Index(
+            'ux_payments_stripe_intent', 'stripe_payment_intent_id', unique=True,
+            postgresql_where=db.text("stripe_payment_intent_id IS NOT NULL"),
+            sqlite_where=db.text("stripe_payment_intent_id IS NOT NULL")
+        ),
+    )
     
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     payment_reference = db.Column(db.String(50), unique=True, nullable=False, index=True)
@@ -42,6 +58,12 @@ class Payment(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.now(timezone.utc), nullable=False)
     paid_at = db.Column(db.DateTime)
     
+    # Columns to_dict reads; payment_metadata in particular is left out
+    SUMMARY_COLUMNS = (
+        'id', 'payment_reference', 'amount', 'currency', 'status',
+        'payment_method', 'created_at'
+    )
+    
     def __init__(self, **kwargs):
         super(Payment, self).__init__(**kwargs)
         if not self.payment_reference:
@@ -54,13 +76,70 @@ class Payment(db.Model):
         chars = ''.join(random.choices(string.ascii_uppercase + string.digits, k=8))
         return f"PAY-{chars}"
     
-    def to_dict(self):
+    @staticmethod
+    def paid_total_for(booking_id):
+        """SUM of PAID amounts for a booking id (value or correlated column)"""
+        payments = Payment.__table__
+        return select(func.coalesce(func.sum(payments.c.amount), 0)).where(
+            payments.c.booking_id == booking_id,
+            payments.c.status == PaymentStatus.PAID
+        ).scalar_subquery()
+    
+    @staticmethod
+    def sync_booking_amount_paid(connection, booking_id=None):
+        """
+        Recompute bookings.amount_paid from PAID payments
+        
+        Limited to one booking when booking_id is given, otherwise every booking.
+        updated_at is left alone; a payment is not an edit of the booking.
+        """
+        from app.models.booking import Booking
+        bookings = Booking.__table__
+        
+        stmt = bookings.update().values(
+            amount_paid=Payment.paid_total_for(bookings.c.id),
+            updated_at=bookings.c.updated_at
+        )
+        if booking_id is not None:
+            stmt = stmt.where(bookings.c.id == booking_id)
+        
+        return connection.execute(stmt)
+    
+    @classmethod
+    def summary_columns(cls):
+        """Column attributes read by to_dict, for load_only() or row queries"""
+        return [getattr(cls, name) for name in cls.SUMMARY_COLUMNS]
+    
+    @staticmethod
+    def row_to_dict(row):
+        """Serialize the to_dict fields of a payment or a row selecting those columns"""
         return {
-            'id': self.id,
-            'payment_reference': self.payment_reference,
-            'amount': float(self.amount),
-            'currency': self.currency,
-            'status': self.status.value,
-            'payment_method': self.payment_method,
-            'created_at': self.created_at.isoformat()
-        }
\ No newline at end of file
+            'id': row.id,
+            'payment_reference': row.payment_reference,
+            'amount': float(row.amount),
+            'currency': row.currency,
+            'status': row.status.value,
+            'payment_method': row.payment_method,
+            'created_at': row.created_at.isoformat()
+        }
+    
+    def to_dict(self):
+        return Payment.row_to_dict(self)
+
+@event.listens_for(Payment, 'after_insert')
+@event.listens_for(Payment, 'after_delete')
+def _payment_written(mapper, connection, target):
+    Payment.sync_booking_amount_paid(connection, target.booking_id)
+
+
+@event.listens_for(Payment, 'after_update')
+def _payment_updated(mapper, connection, target):
+    state = inspect(target)
+    if any(state.attrs[key].history.has_changes() for key in ('status', 'amount', 'booking_id')):
+        Payment.sync_booking_amount_paid(connection, target.booking_id)
+        
+        # Moving a payment between bookings also changes the old one
+        old_booking_ids = state.attrs.booking_id.history.deleted
+        for old_booking_id in old_booking_ids:
+            if old_booking_id:
+                Payment.sync_booking_amount_paid(connection, old_booking_id)
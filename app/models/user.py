@@ -51,7 +51,8 @@ class User(UserMixin, db.Model):
     
     # Timestamps
     created_at = db.Column(db.DateTime, default=datetime.now(timezone.utc), nullable=False)
-    updated_at = db.Column(db.DateTime, default=datetime.now(timezone.utc), onupdate=datetime.now(timezone.utc))
+    # Stamped by the database on every UPDATE, including bulk update() statements
+    updated_at = db.Column(db.DateTime, server_default=db.func.now(), onupdate=db.func.now())
     last_login = db.Column(db.DateTime)
     
     # Relationships
@@ -68,6 +69,15 @@ class User(UserMixin, db.Model):
         backref=db.backref('favorited_by', lazy='dynamic'), 
         lazy='dynamic'
     )
+    # Read-only view of favorites that are still active; the filter is part of
+    # the join, so loading it needs no follow-up query
+    active_favorite_packages = db.relationship(
+        'Package',
+        secondary='user_favorites',
+        secondaryjoin='and_(Package.id == user_favorites.c.package_id, Package.is_active == True)',
+        viewonly=True,
+        lazy='select'
+    )
 
     # Association table for favorites
     user_favorites = db.Table('user_favorites',
@@ -76,6 +86,33 @@ class User(UserMixin, db.Model):
         db.Column('created_at', db.DateTime, default=datetime.now(timezone.utc))
     )
     
+    # Columns read by the client profile endpoint
+    PROFILE_COLUMNS = (
+        'id', 'email', 'first_name', 'last_name', 'phone',
+        'date_of_birth', 'passport_number', 'passport_expiry', 'nationality',
+        'preferred_airline', 'frequent_flyer_numbers', 'dietary_preferences',
+        'special_assistance', 'company_name', 'company_tax_id', 'billing_address',
+        'role', 'subscription_tier', 'referral_code', 'referral_credits',
+        'email_verified', 'created_at', 'last_login'
+    )
+    
+    @classmethod
+    def profile_columns(cls):
+        """Column attributes read by the profile endpoint, for select() or load_only()"""
+        return [getattr(cls, name) for name in cls.PROFILE_COLUMNS]
+    
+    # Columns read and written by the client subscription endpoints
+    SUBSCRIPTION_COLUMNS = (
+        'id', 'email', 'first_name', 'last_name', 'is_active',
+        'subscription_tier', 'subscription_start', 'subscription_end',
+        'monthly_bookings_used'
+    )
+    
+    @classmethod
+    def subscription_columns(cls):
+        """Column attributes used by the subscription endpoints, for load_only()"""
+        return [getattr(cls, name) for name in cls.SUBSCRIPTION_COLUMNS]
+    
     def set_password(self, password):
         self.password_hash = generate_password_hash(password)
     
@@ -86,12 +123,16 @@ class User(UserMixin, db.Model):
         return f"{self.first_name} {self.last_name}"
     
     def has_active_subscription(self):
-        if not self.subscription_end:
+        return User.subscription_active_until(self.subscription_end)
+    
+    @staticmethod
+    def subscription_active_until(subscription_end):
+        """Check a subscription end date (naive values are UTC) against now"""
+        if not subscription_end:
             return False
-        end = self.subscription_end
-        if end.tzinfo is None:
-            end = end.replace(tzinfo=timezone.utc)
-        return datetime.now(timezone.utc) < end
+        if subscription_end.tzinfo is None:
+            subscription_end = subscription_end.replace(tzinfo=timezone.utc)
+        return datetime.now(timezone.utc) < subscription_end
     
     def can_book(self):
         """Check if user can make more bookings based on subscription"""
@@ -103,6 +144,15 @@ class User(UserMixin, db.Model):
             return self.monthly_bookings_used < 6
         return True  # No subscription = pay per booking
     
+    def get_token_claims(self):
+        """Additional claims embedded in access tokens so hot endpoints can skip the user lookup"""
+        return {
+            'email': self.email,
+            'role': self.role.value,
+            'act': bool(self.is_active),
+            'tier': self.subscription_tier.value if self.subscription_tier else SubscriptionTier.NONE.value
+        }
+    
     def to_dict(self):
         return {
             'id': self.id,
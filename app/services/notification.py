@@ -103,7 +103,7 @@ class NotificationService:
                 f"to {booking.destination} has been confirmed."
             )
             
-            notification = self._create_notification(
+            notification = self.create_notification(
                 user_id=user.id,
                 notification_type=NotificationType.BOOKING_CONFIRMED.value,
                 title=title,
@@ -145,7 +145,7 @@ class NotificationService:
                 f"If you paid for this booking, a refund will be processed within 5-7 business days."
             )
             
-            notification = self._create_notification(
+            notification = self.create_notification(
                 user_id=user.id,
                 notification_type=NotificationType.BOOKING_CANCELLED.value,
                 title=title,
@@ -188,7 +188,7 @@ class NotificationService:
                 f"for booking {booking.booking_reference}."
             )
             
-            self._create_notification(
+            self.create_notification(
                 user_id=user.id,
                 notification_type=NotificationType.PAYMENT_RECEIVED.value,
                 title=title,
@@ -229,7 +229,7 @@ class NotificationService:
                 f"is in {days_until_departure} days. Booking reference: {booking.booking_reference}"
             )
             
-            self._create_notification(
+            self.create_notification(
                 user_id=user.id,
                 notification_type=NotificationType.BOOKING_REMINDER.value,
                 title=title,
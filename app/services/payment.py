@@ -11,6 +11,23 @@ from decimal import Decimal
 logger = logging.getLogger(__name__)
 
 
+def configure_stripe_client(config):
+    """
+    Install a keep-alive HTTP client for stripe-python with bounded timeouts
+    
+    RequestsClient keeps a pooled session per thread, so each worker reuses its
+    TLS connection to Stripe rather than handshaking on every call. Network
+    retries carry Stripe idempotency keys, so retried POSTs are safe.
+    
+    Args:
+        config: Flask app config object
+    """
+    stripe.default_http_client = stripe.RequestsClient(
+        timeout=config.get('STRIPE_HTTP_TIMEOUT', 10)
+    )
+    stripe.max_network_retries = config.get('STRIPE_MAX_NETWORK_RETRIES', 2)
+
+
 class PaymentServiceError(Exception):
     """Base exception for payment service errors"""
     pass
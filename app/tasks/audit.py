@@ -0,0 +1,123 @@
+"""
+Batched audit log writer
+Buffers audit entries in memory and inserts them in bulk from a background thread
+"""
+import atexit
+import queue
+import threading
+import time
+from flask import current_app
+from sqlalchemy import insert
+
+from app.extensions import db
+
+_queue = queue.Queue()
+_STOP = object()
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def enqueue_audit_log(entry: dict):
+    """
+    Queue one audit_logs row for the next batched insert
+
+    The entry is written within AUDIT_FLUSH_INTERVAL seconds (0.5 by default), or
+    as soon as AUDIT_BATCH_SIZE entries are waiting. When TASKS_ALWAYS_EAGER is set
+    (defaults to app.testing) the entry is written inline instead.
+    """
+    from app.utils.audit_logging import AuditLogger
+
+    app = current_app._get_current_object()
+
+    if app.config.get('TASKS_ALWAYS_EAGER', app.testing):
+        try:
+            AuditLogger.log_action(**entry)
+        except Exception as e:
+            db.session.rollback()
+            app.logger.error(f"Failed to write audit log: {str(e)}")
+        return
+
+    _queue.put((app, entry))
+    _ensure_worker()
+
+
+def flush_audit_logs():
+    """Write every queued entry now"""
+    batch = []
+    while True:
+        try:
+            item = _queue.get_nowait()
+        except queue.Empty:
+            break
+        if item is not _STOP:
+            batch.append(item)
+    _write_batch(batch)
+
+
+def _ensure_worker():
+    global _worker
+
+    if _worker is not None and _worker.is_alive():
+        return
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_drain_forever, name='thrive-audit', daemon=True)
+            _worker.start()
+
+
+def _drain_forever():
+    while True:
+        item = _queue.get()
+        if item is _STOP:
+            return
+        batch = [item]
+        config = item[0].config
+        batch_size = config.get('AUDIT_BATCH_SIZE', 100)
+        deadline = time.monotonic() + config.get('AUDIT_FLUSH_INTERVAL', 0.5)
+
+        while len(batch) < batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = _queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                _write_batch(batch)
+                return
+            batch.append(item)
+
+        _write_batch(batch)
+
+
+def _write_batch(batch):
+    """Insert queued entries with one executemany INSERT per app"""
+    from app.models import AuditLog
+
+    entries_by_app = {}
+    for app, entry in batch:
+        entries_by_app.setdefault(app, []).append(entry)
+
+    for app, entries in entries_by_app.items():
+        with app.app_context():
+            try:
+                db.session.execute(insert(AuditLog), entries)
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                app.logger.error(f"Failed to write {len(entries)} audit logs: {str(e)}")
+            finally:
+                db.session.remove()
+
+
+def _shutdown():
+    """Let the worker write the batch it holds, then flush whatever is left"""
+    worker = _worker
+    if worker is not None and worker.is_alive():
+        _queue.put(_STOP)
+        worker.join(timeout=5)
+    flush_audit_logs()
+
+
+atexit.register(_shutdown)
@@ -0,0 +1,72 @@
+"""
+Background task dispatch
+Runs request side effects (emails, notifications, audit entries) off the request thread,
+and fans independent read queries out across threads
+"""
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app
+
+from app.extensions import db
+
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='thrive-tasks')
+_query_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='thrive-queries')
+
+
+def run_in_background(func, *args, **kwargs):
+    """
+    Run func(*args, **kwargs) on the background worker pool inside an app context
+
+    Call this only after the request's own db.session.commit() has succeeded so
+    tasks never act on rolled-back state. Pass plain ids and values rather than
+    ORM instances, which are bound to the request's session.
+
+    When TASKS_ALWAYS_EAGER is set (defaults to app.testing) the task runs inline.
+    """
+    app = current_app._get_current_object()
+
+    def _run():
+        with app.app_context():
+            try:
+                func(*args, **kwargs)
+            except Exception as e:
+                db.session.rollback()
+                app.logger.error(f"Background task {func.__name__} failed: {str(e)}")
+            finally:
+                db.session.remove()
+
+    if app.config.get('TASKS_ALWAYS_EAGER', app.testing):
+        try:
+            func(*args, **kwargs)
+        except Exception as e:
+            db.session.rollback()
+            app.logger.error(f"Background task {func.__name__} failed: {str(e)}")
+        return None
+
+    return _executor.submit(_run)
+
+
+def run_parallel(*calls):
+    """
+    Run independent read-only callables concurrently and return their results in order
+
+    Each call runs in its own app context, so it gets its own session and pooled
+    connection; the pool (DB_POOL_SIZE, 10 by default) covers the 4 query workers.
+    Calls must return plain values rather than ORM instances, because their
+    session is removed as soon as they finish. Exceptions are re-raised here.
+
+    When PARALLEL_QUERIES is off (defaults to not app.testing) the calls run inline.
+    """
+    app = current_app._get_current_object()
+
+    if not app.config.get('PARALLEL_QUERIES', not app.testing):
+        return [call() for call in calls]
+
+    def _run(call):
+        with app.app_context():
+            try:
+                return call()
+            finally:
+                db.session.remove()
+
+    futures = [_query_executor.submit(_run, call) for call in calls]
+    return [future.result() for future in futures]
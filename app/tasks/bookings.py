@@ -0,0 +1,105 @@
+"""
+Booking side-effect tasks
+Run once the booking change is committed, via run_in_background or the audit batch
+"""
+from datetime import datetime, timezone
+from decimal import Decimal
+from flask import current_app
+import stripe
+
+from app.extensions import db
+from app.models import User, Booking, Payment
+from app.models.enums import BookingStatus, PaymentStatus
+from app.utils.email import EmailService
+from app.utils.audit_logging import AuditLogger
+from app.services.notification import NotificationService
+
+
+def send_cancellation_email(user_id: str, booking_reference: str, refund_amount: float):
+    """Email the customer that their booking was cancelled"""
+    try:
+        user = User.query.get(user_id)
+        if not user:
+            return
+        
+        EmailService.send_email(
+            to=user.email,
+            subject=f'Booking Cancelled - {booking_reference}',
+            body=f"""
+            Hello {user.first_name},
+            
+            Your booking {booking_reference} has been cancelled.
+            
+            Refund Amount: ${refund_amount:.2f}
+            
+            If you have any questions, please contact our support team.
+            
+            Thank you for using Thrive Travel.
+            """
+        )
+    except Exception as e:
+        current_app.logger.error(f"Failed to send cancellation email: {str(e)}")
+
+
+def create_cancellation_notification(user_id: str, booking_id: str, booking_reference: str, refund_amount: float):
+    """Create the in-app notification for a cancelled booking"""
+    try:
+        NotificationService.create_notification(
+            user_id=user_id,
+            notification_type='booking_cancelled',
+            title='Booking Cancelled',
+            message=f'Your booking {booking_reference} has been cancelled. Refund: ${refund_amount:.2f}',
+            booking_id=booking_id
+        )
+    except Exception as e:
+        current_app.logger.error(f"Failed to create notification: {str(e)}")
+
+
+def audit_cancellation(user_id: str, booking_id: str, booking_reference: str,
+                       ip_address: str = None, user_agent: str = None):
+    """Queue the cancellation for the batched audit writer"""
+    try:
+        AuditLogger.enqueue(
+            user_id=user_id,
+            action='booking_cancelled',
+            entity_type='booking',
+            entity_id=booking_id,
+            description=f'Booking {booking_reference} cancelled',
+            ip_address=ip_address,
+            user_agent=user_agent
+        )
+    except Exception as e:
+        current_app.logger.error(f"Failed to log booking cancellation: {str(e)}")
+
+
+def process_stripe_refund(payment_id: str, booking_id: str, amount_cents: int):
+    """
+    Issue a Stripe refund for a cancelled booking and record it
+    
+    The idempotency key is derived from the payment so a retried task can
+    never refund the same charge twice.
+    """
+    payment = Payment.query.get(payment_id)
+    if not payment or not payment.stripe_charge_id or payment.status == PaymentStatus.REFUNDED:
+        return
+    
+    try:
+        stripe.api_key = current_app.config.get('STRIPE_SECRET_KEY')
+        stripe.Refund.create(
+            charge=payment.stripe_charge_id,
+            amount=amount_cents,
+            idempotency_key=f"refund:{payment.id}"
+        )
+    except stripe.error.StripeError as e:
+        current_app.logger.error(f"Stripe refund error: {str(e)}")
+        return
+    
+    payment.refund_amount = Decimal(amount_cents) / 100
+    payment.status = PaymentStatus.REFUNDED
+    payment.refunded_at = datetime.now(timezone.utc)
+    
+    booking = Booking.query.get(booking_id)
+    if booking:
+        booking.status = BookingStatus.REFUNDED
+    
+    db.session.commit()
@@ -0,0 +1,47 @@
+"""
+Payment side-effect tasks
+Dispatched with run_in_background once the payment is committed
+"""
+from flask import current_app
+from sqlalchemy.orm import joinedload
+
+from app.models import Payment
+from app.utils.email import EmailService
+from app.services.notification import NotificationService
+
+
+def _load_payment(payment_id: str):
+    return Payment.query.options(
+        joinedload(Payment.booking),
+        joinedload(Payment.user)
+    ).filter_by(id=payment_id).first()
+
+
+def send_payment_confirmation(payment_id: str):
+    """Notify the customer, in-app and by email, that their payment was received"""
+    try:
+        payment = _load_payment(payment_id)
+        if not payment:
+            return
+
+        NotificationService().send_payment_confirmation(payment.user, payment, payment.booking)
+    except Exception as e:
+        current_app.logger.error(f"Failed to send payment confirmation: {str(e)}")
+
+
+def notify_admin_of_payment(payment_id: str):
+    """Email the admin inbox about a received payment"""
+    try:
+        payment = _load_payment(payment_id)
+        if not payment:
+            return
+
+        admin_email = current_app.config.get('ADMIN_EMAIL') or 'admin@thrive-travel.com'
+        admin_msg = f"""
+        PAYMENT RECEIVED: {payment.booking.booking_reference}
+        Amount: ${float(payment.amount)}
+        User: {payment.user.email}
+        """
+        EmailService.send_email(admin_email, "Payment Received", admin_msg, html=admin_msg)
+    except Exception as e:
+        current_app.logger.error(f"Failed to send admin payment email: {str(e)}")
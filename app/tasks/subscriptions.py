@@ -0,0 +1,66 @@
+"""
+Subscription side-effect tasks
+Run once the subscription change is committed, via run_in_background or the audit batch
+"""
+from flask import current_app
+
+from app.models import User
+from app.utils.email import EmailService
+from app.utils.audit_logging import AuditLogger
+from app.services.notification import NotificationService
+
+
+def send_subscription_email(user_id: str, tier: str):
+    """Email the customer that their subscription was upgraded"""
+    try:
+        user = User.query.get(user_id)
+        if not user:
+            return
+        
+        renewal_date = user.subscription_end.strftime('%B %d, %Y') if user.subscription_end else None
+        EmailService.send_email(
+            to=user.email,
+            subject=f'Subscription Upgraded to {tier.upper()}',
+            body=f"""
+            Hello {user.first_name},
+            
+            Your subscription has been successfully upgraded to {tier.upper()}!
+            
+            Your new subscription is active and will renew on {renewal_date}.
+            
+            Thank you for choosing Thrive Travel!
+            """
+        )
+    except Exception as e:
+        current_app.logger.error(f"Failed to send subscription email: {str(e)}")
+
+
+def create_subscription_notification(user_id: str, tier: str):
+    """Create the in-app notification for an upgraded subscription"""
+    try:
+        NotificationService.create_notification(
+            user_id=user_id,
+            notification_type='subscription_upgraded',
+            title='Subscription Upgraded!',
+            message=f'Your subscription has been upgraded to {tier.upper()}. Enjoy your new benefits!'
+        )
+    except Exception as e:
+        current_app.logger.error(f"Failed to create notification: {str(e)}")
+
+
+def audit_subscription_upgrade(user_id: str, payment_id: str, tier: str,
+                               ip_address: str = None, user_agent: str = None):
+    """Queue the subscription upgrade for the batched audit writer"""
+    try:
+        AuditLogger.enqueue(
+            user_id=user_id,
+            action='subscription_upgraded',
+            entity_type='payment',
+            entity_id=payment_id,
+            description=f'Subscription upgraded to {tier.upper()}',
+            changes={'tier': tier},
+            ip_address=ip_address,
+            user_agent=user_agent
+        )
+    except Exception as e:
+        current_app.logger.error(f"Failed to log subscription upgrade: {str(e)}")
@@ -1,7 +1,7 @@
-from flask import jsonify, current_app
+from flask import jsonify, current_app, request
 from functools import wraps
 from flask_login import current_user
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 import random
 import string
@@ -12,6 +12,21 @@ import requests
 class AuditLogger:
     """Log important actions for audit trail"""
     
+    USER_AGENT_MAX_LENGTH = 500  # AuditLog.user_agent column size
+    
+    @staticmethod
+    def request_origin():
+        """
+        Client address and User-Agent of the current request
+        
+        Read once at the top of a handler so background audit tasks get plain
+        values; the User-Agent is cut to fit the audit column.
+        """
+        user_agent = request.headers.get('User-Agent')
+        if user_agent:
+            user_agent = user_agent[:AuditLogger.USER_AGENT_MAX_LENGTH]
+        return request.remote_addr, user_agent
+    
     @staticmethod
     def log_action(
         user_id: str,
@@ -21,7 +36,8 @@ class AuditLogger:
         description: str = None,
         changes: dict = None,
         ip_address: str = None,
-        user_agent: str = None
+        user_agent: str = None,
+        created_at: datetime = None
     ):
         """Log an action to audit trail"""
         from app.models import AuditLog
@@ -37,7 +53,40 @@ class AuditLogger:
             ip_address=ip_address,
             user_agent=user_agent
         )
+        if created_at is not None:
+            log.created_at = created_at
         
         db.session.add(log)
         db.session.commit()
-        return log
\ No newline at end of file
+        return log
+    
+    @staticmethod
+    def enqueue(
+        user_id: str,
+        action: str,
+        entity_type: str = None,
+        entity_id: str = None,
+        description: str = None,
+        changes: dict = None,
+        ip_address: str = None,
+        user_agent: str = None
+    ):
+        """
+        Queue an action for the batched audit writer instead of inserting it now
+        
+        The timestamp is taken here, so entries keep the time of the action
+        even though they are written a moment later.
+        """
+        from app.tasks.audit import enqueue_audit_log
+        
+        enqueue_audit_log({
+            'user_id': user_id,
+            'action': action,
+            'entity_type': entity_type,
+            'entity_id': entity_id,
+            'description': description,
+            'changes': changes,
+            'ip_address': ip_address,
+            'user_agent': user_agent,
+            'created_at': datetime.now(timezone.utc)
+        })
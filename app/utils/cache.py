@@ -0,0 +1,225 @@
+"""
+In-process response caching
+Short-lived caches for expensive, slowly changing read endpoints
+"""
+import threading
+from collections import namedtuple
+from cachetools import TTLCache
+from flask import current_app
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session, object_session
+
+
+class ResponseCache:
+    """
+    Thread-safe TTL cache for computed response payloads
+
+    Entries live in the worker process, so writes made by another process are
+    only picked up once the TTL expires. Keep TTLs short.
+
+    Caching is skipped when RESPONSE_CACHE_ENABLED is false (defaults to
+    not app.testing).
+    """
+
+    def __init__(self, name, ttl, maxsize=1024):
+        self.name = name
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+        self._inflight = {}
+
+    @staticmethod
+    def _enabled():
+        return current_app.config.get('RESPONSE_CACHE_ENABLED', not current_app.testing)
+
+    def get(self, key):
+        """Return the cached value for key, or None"""
+        if not self._enabled():
+            return None
+        with self._lock:
+            return self._cache.get(key)
+
+    def set(self, key, value):
+        """Cache value under key"""
+        if not self._enabled():
+            return
+        with self._lock:
+            self._cache[key] = value
+
+    def get_or_set(self, key, compute):
+        """
+        Return the cached value for key, computing it on a miss
+
+        Concurrent misses for the same key are coalesced: one caller runs
+        compute() while the others wait for its result instead of repeating
+        the work. None results are returned but not cached.
+        """
+        if not self._enabled():
+            return compute()
+        
+        with self._lock:
+            value = self._cache.get(key)
+            if value is not None:
+                return value
+            done = self._inflight.get(key)
+            leader = done is None
+            if leader:
+                done = self._inflight[key] = threading.Event()
+        
+        if not leader:
+            done.wait()
+            with self._lock:
+                value = self._cache.get(key)
+            # The leader failed or found nothing; work it out independently
+            return value if value is not None else compute()
+        
+        try:
+            value = compute()
+            if value is not None:
+                with self._lock:
+                    self._cache[key] = value
+            return value
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            done.set()
+    
+    def delete(self, key):
+        """Drop key if cached"""
+        with self._lock:
+            self._cache.pop(key, None)
+
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            self._cache.clear()
+
+
+# Dashboard summary payloads keyed by user id
+dashboard_summary_cache = ResponseCache('dashboard_summary', ttl=60)
+
+# Monthly spending chart keyed by user id; only changes when payments do
+dashboard_chart_cache = ResponseCache('dashboard_chart', ttl=3600)
+
+# Minimal user identity records keyed by user id (see get_cached_user)
+user_identity_cache = ResponseCache('user_identity', ttl=60)
+
+# Client profile payloads keyed by user id
+profile_cache = ResponseCache('profile', ttl=300)
+
+# Client explore-packages payloads keyed by normalized search text
+explore_packages_cache = ResponseCache('explore_packages', ttl=300, maxsize=256)
+
+# Featured package list shared by every explore search
+featured_packages_cache = ResponseCache('featured_packages', ttl=60, maxsize=1)
+
+# Rendered invoice PDFs keyed by (payment id, payment status)
+invoice_pdf_cache = ResponseCache('invoice_pdf', ttl=86400, maxsize=128)
+
+
+UserIdentity = namedtuple(
+    'UserIdentity',
+    ('id', 'email', 'first_name', 'last_name', 'role', 'subscription_tier', 'is_active')
+)
+
+
+def get_cached_user(user_id):
+    """
+    Identity fields of a user, or None if there is no such user
+
+    For display data (name, email) where a slightly stale copy is harmless.
+    The cache is per process and only the worker that wrote the user drops
+    its entry, so other workers can serve it for up to the 60s TTL; do not
+    base authorization decisions on it.
+    """
+    from app.extensions import db
+    from app.models import User
+    
+    def load():
+        row = db.session.execute(
+            select(*(getattr(User, field) for field in UserIdentity._fields)).where(User.id == user_id)
+        ).first()
+        return UserIdentity(*row) if row is not None else None
+    
+    return user_identity_cache.get_or_set(user_id, load)
+
+
+def _invalidate_user_dashboard(user_id):
+    if user_id:
+        dashboard_summary_cache.delete(user_id)
+        dashboard_chart_cache.delete(user_id)
+
+
+def _queue_invalidation(target, invalidate, *args):
+    """
+    Run invalidate(*args) once the session that flushed target commits
+
+    Mapper events fire at flush time, before the transaction commits; dropping
+    entries then would let a concurrent read re-cache the pre-commit row.
+    """
+    session = object_session(target)
+    if session is None:
+        invalidate(*args)
+        return
+    session.info.setdefault('cache_invalidations', set()).add((invalidate, args))
+
+
+def _run_queued_invalidations(session):
+    for invalidate, args in session.info.pop('cache_invalidations', ()):
+        invalidate(*args)
+
+
+def _on_user_owned_write(mapper, connection, target):
+    _queue_invalidation(target, _invalidate_user_dashboard, target.user_id)
+
+
+def invalidate_user_caches(user_id):
+    """
+    Drop every cached payload built from a user row
+
+    Committed ORM writes are covered by register_cache_invalidation; call this
+    after committing bulk UPDATE statements, which bypass the mapper events.
+    """
+    _invalidate_user_dashboard(user_id)
+    profile_cache.delete(user_id)
+    user_identity_cache.delete(user_id)
+
+
+def _on_user_write(mapper, connection, target):
+    _queue_invalidation(target, invalidate_user_caches, target.id)
+
+
+def _clear_package_caches():
+    explore_packages_cache.clear()
+    featured_packages_cache.clear()
+
+
+def _on_package_write(mapper, connection, target):
+    _queue_invalidation(target, _clear_package_caches)
+
+
+def register_cache_invalidation():
+    """
+    Drop cached data whenever the rows it is built from change
+
+    Writes are collected per session at flush and applied once the transaction
+    ends. After a rollback they are applied too: an extra drop only costs a
+    recompute, while skipping one after a savepoint rollback could leave
+    committed changes cached stale.
+    """
+    from app.models import User, Booking, Payment, Notification, Package
+
+    listeners = [(model, _on_user_owned_write) for model in (Booking, Payment, Notification)]
+    listeners.append((User, _on_user_write))
+    listeners.append((Package, _on_package_write))
+
+    for model, handler in listeners:
+        for identifier in ('after_insert', 'after_update', 'after_delete'):
+            if not event.contains(model, identifier, handler):
+                event.listen(model, identifier, handler)
+
+    for identifier, handler in (
+        ('after_commit', _run_queued_invalidations),
+        ('after_rollback', _run_queued_invalidations),
+    ):
+        if not event.contains(Session, identifier, handler):
+            event.listen(Session, identifier, handler)
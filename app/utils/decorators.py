@@ -47,6 +47,8 @@ def admin_required():
     Uses flask_jwt_extended for token validation
     """
     from flask_jwt_extended import jwt_required, get_jwt_identity
+    from sqlalchemy.orm import load_only
+    from app.extensions import db
     from app.models import User
     from app.models.enums import UserRole
     
@@ -57,8 +59,9 @@ def admin_required():
             # Get user ID from JWT token
             user_id = get_jwt_identity()
             
-            # Fetch user from database
-            user = User.query.get(user_id)
+            # Read the authorization columns fresh on every request; a cached copy
+            # would let a deactivated or demoted admin through on other workers
+            user = db.session.get(User, user_id, options=[load_only(User.is_active, User.role)])
             
             # Check if user exists and is active
             if not user or not user.is_active:
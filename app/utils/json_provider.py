@@ -0,0 +1,41 @@
+"""
+orjson-backed JSON provider for Flask
+Keeps the default provider's output format (sorted keys, HTTP-date datetimes,
+Decimals as strings) while encoding in C.
+"""
+import orjson
+from flask.json.provider import DefaultJSONProvider
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that serializes with orjson"""
+    
+    def _dumpb(self, obj, sort_keys=None, indent=None, default=None):
+        """Serialize obj to UTF-8 JSON bytes"""
+        # Route datetimes through the default hook so they keep Flask's format
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if (self.sort_keys if sort_keys is None else sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        
+        return orjson.dumps(obj, default=default or self.default, option=option)
+    
+    def dumps(self, obj, **kwargs):
+        """Serialize obj to a JSON string"""
+        return self._dumpb(
+            obj,
+            sort_keys=kwargs.get('sort_keys'),
+            indent=kwargs.get('indent'),
+            default=kwargs.get('default')
+        ).decode()
+    
+    def response(self, *args, **kwargs):
+        """Build a JSON response from orjson's bytes without a str round trip"""
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(self._dumpb(obj, indent=indent) + b"\n", mimetype=self.mimetype)
+    
+    def loads(self, s, **kwargs):
+        """Deserialize a JSON string or bytes"""
+        return orjson.loads(s)
@@ -2,6 +2,10 @@ from flask import jsonify, current_app
 from functools import wraps
 from flask_login import current_user
 from datetime import datetime, timedelta
+from typing import Optional, Tuple
+from sqlalchemy import tuple_
+import base64
+import binascii
 
 
 class SearchHelper:
@@ -26,6 +30,51 @@ class SearchHelper:
             'has_prev': pagination.has_prev
         }
     
+    @staticmethod
+    def encode_cursor(created_at: datetime, item_id: str) -> str:
+        """Encode a (created_at, id) position as an opaque cursor string"""
+        raw = f"{created_at.isoformat()}|{item_id}"
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+    
+    @staticmethod
+    def decode_cursor(cursor: str) -> Optional[Tuple[datetime, str]]:
+        """Decode a cursor produced by encode_cursor, or None if malformed"""
+        try:
+            raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+            created_at, item_id = raw.split('|', 1)
+            return datetime.fromisoformat(created_at), item_id
+        except (ValueError, TypeError, binascii.Error):
+            return None
+    
+    @staticmethod
+    def keyset_paginate(query, created_field, id_field, cursor: Optional[Tuple[datetime, str]] = None,
+                        per_page: int = 20):
+        """
+        Seek-paginate a query newest first on (created_at, id)
+        
+        Unlike paginate_query this never runs a COUNT, so page cost stays
+        proportional to per_page regardless of table size.
+        """
+        if cursor:
+            query = query.filter(tuple_(created_field, id_field) < cursor)
+        
+        rows = query.order_by(created_field.desc(), id_field.desc()).limit(per_page + 1).all()
+        has_next = len(rows) > per_page
+        items = rows[:per_page]
+        
+        next_cursor = None
+        if has_next:
+            last = items[-1]
+            next_cursor = SearchHelper.encode_cursor(getattr(last, created_field.key), getattr(last, id_field.key))
+        
+        return {
+            'items': items,
+            'per_page': per_page,
+            'has_next': has_next,
+            'has_prev': cursor is not None,
+            'next_cursor': next_cursor
+        }
+    
     @staticmethod
     def filter_by_date_range(query, date_field, start_date, end_date):
         """Filter query by date range"""
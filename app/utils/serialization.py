@@ -0,0 +1,13 @@
+"""
+Small value converters shared by the hand-built response payloads
+"""
+
+
+def enum_value(value):
+    """Wire value of an enum member, or None"""
+    return value.value if value is not None else None
+
+
+def iso_or_none(value):
+    """ISO 8601 string for a date/datetime, or None"""
+    return value.isoformat() if value is not None else None
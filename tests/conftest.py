@@ -1,6 +1,9 @@
 import pytest
+from contextlib import contextmanager
+from sqlalchemy import event
 from app import create_app
 from app.extensions import db as _db
+from app.utils import cache as response_caches
 from config import Config
 
 class TestConfig(Config):
@@ -34,3 +37,34 @@ def runner(app):
 @pytest.fixture
 def db(app):
     return _db
+
+@pytest.fixture(autouse=True)
+def clear_response_caches():
+    """Response caches are module globals; start and end every test with them empty"""
+    caches = [value for value in vars(response_caches).values()
+              if isinstance(value, response_caches.ResponseCache)]
+    for cache in caches:
+        cache.clear()
+    yield
+    for cache in caches:
+        cache.clear()
+
+@pytest.fixture
+def capture_sql(app):
+    """
+    Context manager factory recording the SQL sent to the database
+    
+    Usage: with capture_sql() as statements: ...
+    """
+    @contextmanager
+    def capture():
+        engine = _db.engine
+        statements = []
+        record = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(engine, 'before_cursor_execute', record)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, 'before_cursor_execute', record)
+    
+    return capture
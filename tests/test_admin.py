@@ -125,6 +125,25 @@ class TestAdminAuthorization:
             headers={'Authorization': f'Bearer {admin_token}'}
         )
         assert response.status_code == 200
+    
+    def test_admin_access_rechecks_role_on_every_request(self, client, admin_token, app):
+        """Test a demotion applies at once, even with an identity cached elsewhere"""
+        from sqlalchemy import update
+        from app.utils.cache import get_cached_user
+        
+        app.config['RESPONSE_CACHE_ENABLED'] = True
+        admin = User.query.filter_by(email='admin@test.com').first()
+        assert get_cached_user(admin.id).role == UserRole.ADMIN
+        
+        # A bulk UPDATE skips the mapper hooks, like a write made by another worker
+        db.session.execute(update(User).where(User.id == admin.id).values(role=UserRole.CUSTOMER))
+        db.session.commit()
+        db.session.expire_all()
+        
+        response = client.get('/api/admin/dashboard',
+            headers={'Authorization': f'Bearer {admin_token}'}
+        )
+        assert response.status_code == 403
 
 
 # ===== DASHBOARD TESTS =====
@@ -0,0 +1,39 @@
+from app.models import AuditLog, User
+from app.utils.audit_logging import AuditLogger
+import app.tasks.audit as audit_tasks
+
+
+def test_enqueue_writes_inline_when_eager(app, db):
+    user = User(email='audit-eager@test.com', first_name='Audit', last_name='Eager', phone='+254700000901')
+    user.set_password('Password123')
+    db.session.add(user)
+    db.session.commit()
+    
+    AuditLogger.enqueue(user_id=user.id, action='profile_updated', entity_type='user', entity_id=user.id)
+    
+    log = AuditLog.query.filter_by(user_id=user.id).one()
+    assert log.action == 'profile_updated'
+
+
+def test_enqueued_entries_are_inserted_in_one_batch(app, db, monkeypatch, capture_sql):
+    # Flush from this thread; the in-memory database is not visible to the worker
+    monkeypatch.setattr(audit_tasks, '_ensure_worker', lambda: None)
+    app.config['TASKS_ALWAYS_EAGER'] = False
+    user = User(email='audit-batch@test.com', first_name='Audit', last_name='Batch', phone='+254700000902')
+    user.set_password('Password123')
+    db.session.add(user)
+    db.session.commit()
+    user_id = user.id
+    
+    for index in range(3):
+        AuditLogger.enqueue(user_id=user_id, action=f'action_{index}', changes={'index': index})
+    assert AuditLog.query.filter_by(user_id=user_id).count() == 0
+    
+    with capture_sql() as statements:
+        audit_tasks.flush_audit_logs()
+    
+    logs = AuditLog.query.filter_by(user_id=user_id).order_by(AuditLog.action).all()
+    assert [log.action for log in logs] == ['action_0', 'action_1', 'action_2']
+    assert [log.changes for log in logs] == [{'index': 0}, {'index': 1}, {'index': 2}]
+    assert all(log.id and log.created_at for log in logs)
+    assert len([statement for statement in statements if statement.startswith('INSERT')]) == 1
@@ -164,15 +164,25 @@ class TestUserRegistration:
         assert 'confirmPassword' in data['errors']
     
     def test_registration_missing_fields(self, client):
-        """Test registration with missing required fields"""
+        """Test registration stops at the first missing field"""
         response = client.post('/api/auth/register', json={
             'email': 'test4@example.com'
         })
         
         assert response.status_code == 422
         data = json.loads(response.data)
-        assert 'fullName' in data['errors']
-        assert 'password' in data['errors']
+        assert 'first_name' in data['errors']
+        assert 'password' not in data['errors']
+    
+    def test_registration_validation_collects_all_errors(self):
+        """Test fail_fast=False reports every invalid field"""
+        from app.api.auth.schemas import AuthSchemas
+        
+        is_valid, errors, _ = AuthSchemas.validate_registration({'email': 'test4@example.com'}, fail_fast=False)
+        
+        assert is_valid is False
+        assert 'first_name' in errors
+        assert 'password' in errors
     
     def test_registration_invalid_referral_code(self, client):
         """Test registration with invalid referral code"""
@@ -189,6 +199,21 @@ class TestUserRegistration:
         assert 'referralCode' in data['errors']
 
 
+    def test_registration_non_ascii_phone(self, client):
+        """Test registration rejects phone numbers with non-ASCII digits"""
+        response = client.post('/api/auth/register', json={
+            'fullName': 'Test User',
+            'email': 'test6@example.com',
+            'password': 'SecurePass123',
+            'confirmPassword': 'SecurePass123',
+            'phone': '\u0661\u0662\u0663\u0664\u0665\u0666\u0667\u0668\u0669\u0660'
+        })
+        
+        assert response.status_code == 422
+        data = json.loads(response.data)
+        assert 'phone' in data['errors']
+
+
 class TestUserLogin:
     """Test user login endpoint"""
     
@@ -206,6 +231,21 @@ class TestUserLogin:
         assert 'tokens' in data['data']
         assert data['data']['user']['email'] == 'test@example.com'
     
+    def test_login_token_carries_status_claims(self, app, client, sample_user):
+        """Test access token embeds account status and tier claims"""
+        from flask_jwt_extended import decode_token
+        
+        response = client.post('/api/auth/login', json={
+            'email': 'test@example.com',
+            'password': 'TestPass123'
+        })
+        
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        claims = decode_token(data['data']['tokens']['accessToken'])
+        assert claims['act'] is True
+        assert claims['tier'] == SubscriptionTier.NONE.value
+    
     def test_login_with_remember_me(self, client, sample_user):
         """Test login with remember me flag"""
         response = client.post('/api/auth/login', json={
@@ -402,6 +442,22 @@ class TestValidationSchemas:
         assert data['data']['user']['first_name'] == 'John'
         assert data['data']['user']['last_name'] == 'Paul Smith Jr.'
     
+    def test_explicit_names_take_precedence_over_full_name(self, client):
+        """Test fullName is ignored when first_name/last_name are given"""
+        response = client.post('/api/auth/register', json={
+            'fullName': 'Ignored Name',
+            'first_name': 'Ada',
+            'last_name': 'Lovelace',
+            'email': 'ada@example.com',
+            'password': 'SecurePass123',
+            'confirmPassword': 'SecurePass123'
+        })
+        
+        assert response.status_code == 201
+        data = json.loads(response.data)
+        assert data['data']['user']['first_name'] == 'Ada'
+        assert data['data']['user']['last_name'] == 'Lovelace'
+    
     def test_email_case_insensitive(self, client, sample_user):
         """Test email is case-insensitive"""
         response = client.post('/api/auth/login', json={
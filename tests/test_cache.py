@@ -0,0 +1,74 @@
+import threading
+
+from app.utils.cache import ResponseCache
+
+
+def test_get_or_set_coalesces_concurrent_misses(app):
+    app.config['RESPONSE_CACHE_ENABLED'] = True
+    cache = ResponseCache('test', ttl=60)
+    release = threading.Event()
+    calls = []
+    results = []
+    
+    def compute():
+        calls.append(1)
+        release.wait(timeout=5)
+        return {'value': 1}
+    
+    def worker():
+        with app.app_context():
+            results.append(cache.get_or_set('key', compute))
+    
+    threads = [threading.Thread(target=worker) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    while not calls:
+        pass
+    release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+    
+    assert len(calls) == 1
+    assert results == [{'value': 1}] * 5
+
+
+def test_get_or_set_does_not_cache_none(app):
+    app.config['RESPONSE_CACHE_ENABLED'] = True
+    cache = ResponseCache('test', ttl=60)
+    calls = []
+    
+    def compute():
+        calls.append(1)
+        return None
+    
+    with app.app_context():
+        assert cache.get_or_set('missing', compute) is None
+        assert cache.get_or_set('missing', compute) is None
+    
+    assert len(calls) == 2
+
+
+def test_get_cached_user_dropped_on_user_write(app):
+    from app.extensions import db
+    from app.models import User
+    from app.utils.cache import get_cached_user, user_identity_cache
+    
+    app.config['RESPONSE_CACHE_ENABLED'] = True
+    with app.app_context():
+        user = User(email='identity@test.com', first_name='Id', last_name='Entity', phone='+254700000999')
+        user.set_password('Password123')
+        db.session.add(user)
+        db.session.commit()
+        user_id = user.id
+        
+        identity = get_cached_user(user_id)
+        assert identity.email == 'identity@test.com'
+        assert identity.is_active is True
+        assert user_identity_cache.get(user_id) == identity
+        
+        user.is_active = False
+        db.session.commit()
+        
+        assert user_identity_cache.get(user_id) is None
+        assert get_cached_user(user_id).is_active is False
+        assert get_cached_user('missing-user') is None
@@ -124,6 +124,101 @@ class TestDashboardSummary:
         assert 'chartData' in data['data']
         assert data['data']['stats']['totalBookings'] >= 1
     
+    def test_dashboard_summary_cached_until_booking_write(self, client, auth_headers, app):
+        """Test cached summary is dropped when the user's bookings change"""
+        app.config['RESPONSE_CACHE_ENABLED'] = True
+        user_id = User.query.filter_by(email='test@example.com').first().id
+        
+        response = client.get('/api/client/dashboard/summary', headers=auth_headers)
+        assert json.loads(response.data)['data']['stats']['totalBookings'] == 0
+        
+        booking = Booking(
+            user_id=user_id,
+            booking_reference='TGT-CACHE1',
+            booking_type='flight',
+            status=BookingStatus.PENDING,
+            base_price=Decimal('100.00'),
+            service_fee=Decimal('10.00'),
+            total_price=Decimal('110.00')
+        )
+        db.session.add(booking)
+        db.session.commit()
+        
+        response = client.get('/api/client/dashboard/summary', headers=auth_headers)
+        assert json.loads(response.data)['data']['stats']['totalBookings'] == 1
+    
+    def test_dashboard_summary_chart_groups_paid_payments_by_month(self, client, auth_headers):
+        """Test the 12-month chart sums paid payments per month and ignores older ones"""
+        user_id = User.query.filter_by(email='test@example.com').first().id
+        booking = Booking(
+            user_id=user_id,
+            booking_reference='TGT-CHART1',
+            booking_type='flight',
+            status=BookingStatus.CONFIRMED,
+            base_price=Decimal('100.00'),
+            service_fee=Decimal('10.00'),
+            total_price=Decimal('110.00')
+        )
+        db.session.add(booking)
+        db.session.commit()
+        booking_id = booking.id
+        now = datetime.now(timezone.utc)
+        
+        for reference, amount, paid_at, status in (
+            ('PAY-CHART1', '100.00', now, PaymentStatus.PAID),
+            ('PAY-CHART2', '50.50', now, PaymentStatus.PAID),
+            ('PAY-CHART3', '999.00', now, PaymentStatus.PENDING),
+            ('PAY-CHART4', '700.00', now - timedelta(days=400), PaymentStatus.PAID)
+        ):
+            db.session.add(Payment(
+                payment_reference=reference,
+                booking_id=booking_id,
+                user_id=user_id,
+                amount=Decimal(amount),
+                status=status,
+                paid_at=paid_at
+            ))
+        db.session.commit()
+        
+        response = client.get('/api/client/dashboard/summary', headers=auth_headers)
+        chart = json.loads(response.data)['data']['chartData']
+        
+        assert len(chart) == 12
+        assert chart[-1] == {'name': now.strftime('%b'), 'total': 150.5}
+        assert sum(month['total'] for month in chart) == 150.5
+    
+    def test_dashboard_summary_stats_in_fixed_query_count(self, client, auth_headers, capture_sql):
+        """Test summary counts come from aggregate queries, not one query per stat"""
+        user_id = User.query.filter_by(email='test@example.com').first().id
+        now = datetime.now(timezone.utc)
+        for index, (status, booking_type, days_ahead) in enumerate((
+            (BookingStatus.CONFIRMED, 'package', 10),
+            (BookingStatus.PENDING, 'flight', 20),
+            (BookingStatus.CONFIRMED, 'flight', 90),
+            (BookingStatus.CANCELLED, 'flight', 5)
+        )):
+            db.session.add(Booking(
+                user_id=user_id,
+                booking_reference=f'TGT-STATS{index}',
+                booking_type=booking_type,
+                status=status,
+                departure_date=now + timedelta(days=days_ahead),
+                base_price=Decimal('100.00'),
+                service_fee=Decimal('10.00'),
+                total_price=Decimal('110.00')
+            ))
+        db.session.commit()
+        
+        with capture_sql() as statements:
+            response = client.get('/api/client/dashboard/summary', headers=auth_headers)
+        
+        stats = json.loads(response.data)['data']['stats']
+        assert stats['totalBookings'] == 4
+        assert stats['confirmedBookings'] == 2
+        assert stats['upcomingBookings'] == 2
+        assert stats['activeTrips'] == 1
+        assert len(statements) <= 4
+    
     def test_dashboard_summary_unauthorized(self, client):
         """Test dashboard summary without authentication"""
         response = client.get('/api/client/dashboard/summary')
@@ -162,6 +257,252 @@ class TestProfileManagement:
         assert data['success'] is True
         assert data['data']['profile']['firstName'] == 'Updated'
     
+    def test_get_profile_cached_until_profile_update(self, client, auth_headers, app):
+        """Test cached profile is dropped when the profile is updated"""
+        app.config['RESPONSE_CACHE_ENABLED'] = True
+        
+        response = client.get('/api/client/dashboard/profile', headers=auth_headers)
+        assert json.loads(response.data)['data']['profile']['firstName'] == 'Test'
+        
+        client.put('/api/client/dashboard/profile', headers=auth_headers, json={'firstName': 'Cached'})
+        
+        response = client.get('/api/client/dashboard/profile', headers=auth_headers)
+        assert json.loads(response.data)['data']['profile']['firstName'] == 'Cached'
+    
+    def test_get_profile_cache_follows_writes_from_other_workers(self, client, auth_headers, app):
+        """Test a cached profile is not served once updated_at moves on"""
+        from sqlalchemy import update
+        
+        app.config['RESPONSE_CACHE_ENABLED'] = True
+        first = client.get('/api/client/dashboard/profile', headers=auth_headers)
+        assert json.loads(first.data)['data']['profile']['firstName'] == 'Test'
+        
+        # A bulk UPDATE skips the local invalidation, like a write from another worker
+        db.session.execute(
+            update(User).where(User.email == 'test@example.com')
+            .values(first_name='Elsewhere', updated_at=datetime(2030, 1, 1))
+        )
+        db.session.commit()
+        
+        response = client.get('/api/client/dashboard/profile',
+            headers={**auth_headers, 'If-None-Match': first.headers['ETag']}
+        )
+        assert response.status_code == 200
+        assert json.loads(response.data)['data']['profile']['firstName'] == 'Elsewhere'
+    
+    def test_profile_cache_dropped_on_commit_not_flush(self, client, auth_headers, app):
+        """Test user writes invalidate the profile cache only once committed"""
+        from app.utils.cache import profile_cache
+        
+        app.config['RESPONSE_CACHE_ENABLED'] = True
+        client.get('/api/client/dashboard/profile', headers=auth_headers)
+        user = User.query.filter_by(email='test@example.com').first()
+        assert profile_cache.get(user.id) is not None
+        
+        user.first_name = 'Flushed'
+        db.session.flush()
+        assert profile_cache.get(user.id) is not None
+        
+        db.session.commit()
+        assert profile_cache.get(user.id) is None
+    
+    def test_get_profile_returns_stored_json(self, client, auth_headers, app):
+        """Test JSON profile columns come back as objects, including from the cache"""
+        app.config['RESPONSE_CACHE_ENABLED'] = True
+        numbers = {'BA': '12345678', 'AA': 'X9'}
+        client.put('/api/client/dashboard/profile', headers=auth_headers, json={'frequentFlyerNumbers': numbers})
+        
+        for _ in range(2):
+            response = client.get('/api/client/dashboard/profile', headers=auth_headers)
+            assert json.loads(response.data)['data']['profile']['frequentFlyerNumbers'] == numbers
+    
+    def test_get_profile_conditional_request(self, client, auth_headers):
+        """Test unchanged profiles are answered with 304 until the profile changes"""
+        first = client.get('/api/client/dashboard/profile', headers=auth_headers)
+        etag = first.headers['ETag']
+        assert etag
+        
+        conditional = dict(auth_headers, **{'If-None-Match': etag})
+        unchanged = client.get('/api/client/dashboard/profile', headers=conditional)
+        assert unchanged.status_code == 304
+        assert unchanged.data == b''
+        assert unchanged.headers['ETag'] == etag
+        
+        client.put('/api/client/dashboard/profile', headers=auth_headers, json={'firstName': 'Changed'})
+        
+        changed = client.get('/api/client/dashboard/profile', headers=conditional)
+        assert changed.status_code == 200
+        assert changed.headers['ETag'] != etag
+        assert json.loads(changed.data)['data']['profile']['firstName'] == 'Changed'
+    
+    def test_get_profile_per_user(self, client, auth_headers):
+        """Test the reused profile statement binds each caller's id"""
+        other = User(email='other@example.com', first_name='Other', last_name='User',
+                     role=UserRole.CUSTOMER, subscription_tier=SubscriptionTier.NONE,
+                     is_active=True, referral_code='OTHER12345', referral_credits=Decimal('0.00'))
+        other.set_password('TestPass123')
+        db.session.add(other)
+        db.session.commit()
+        
+        response = client.post('/api/auth/login', json={'email': 'other@example.com', 'password': 'TestPass123'})
+        other_headers = {'Authorization': f"Bearer {json.loads(response.data)['data']['tokens']['accessToken']}"}
+        
+        first = client.get('/api/client/dashboard/profile', headers=auth_headers)
+        second = client.get('/api/client/dashboard/profile', headers=other_headers)
+        
+        assert json.loads(first.data)['data']['profile']['email'] == 'test@example.com'
+        assert json.loads(second.data)['data']['profile']['email'] == 'other@example.com'
+    
+    def test_get_profile_inactive_token(self, client, sample_user):
+        """Test profile retrieval is refused for a token issued to an inactive user"""
+        from flask_jwt_extended import create_access_token
+        
+        user = User.query.filter_by(email='test@example.com').first()
+        claims = user.get_token_claims()
+        claims['act'] = False
+        token = create_access_token(identity=user.id, additional_claims=claims)
+        
+        response = client.get('/api/client/dashboard/profile', headers={'Authorization': f'Bearer {token}'})
+        
+        assert response.status_code == 401
+    
+    def test_get_profile_single_query(self, client, auth_headers, capture_sql):
+        """Test profile retrieval issues one SQL statement and no relationship loads"""
+        with capture_sql() as statements:
+            response = client.get('/api/client/dashboard/profile', headers=auth_headers)
+        
+        assert response.status_code == 200
+        assert len(statements) <= 1
+    
+    def test_update_profile_stamps_updated_at(self, client, auth_headers):
+        """Test profile update refreshes updated_at"""
+        user = User.query.filter_by(email='test@example.com').first()
+        user.updated_at = datetime(2020, 1, 1)
+        db.session.commit()
+        
+        response = client.put('/api/client/dashboard/profile', headers=auth_headers, json={'lastName': 'Stamped'})
+        
+        assert response.status_code == 200
+        db.session.expire_all()
+        assert User.query.filter_by(email='test@example.com').first().updated_at > datetime(2020, 1, 1)
+    
+    def test_update_profile_unchanged_skips_write(self, client, auth_headers, app):
+        """Test resubmitting the current profile writes nothing"""
+        from app.models import AuditLog
+        
+        user = User.query.filter_by(email='test@example.com').first()
+        user.updated_at = datetime(2020, 1, 1)
+        db.session.commit()
+        
+        for body in ({'firstName': 'Test', 'lastName': 'User', 'phone': '+1234567890'}, {}):
+            response = client.put('/api/client/dashboard/profile', headers=auth_headers, json=body)
+            
+            assert response.status_code == 200
+            data = json.loads(response.data)
+            assert data['message'] == 'Profile is already up to date'
+            assert data['data']['profile']['firstName'] == 'Test'
+        
+        db.session.expire_all()
+        assert User.query.filter_by(email='test@example.com').first().updated_at == datetime(2020, 1, 1)
+        assert AuditLog.query.filter_by(action='profile_updated').count() == 0
+    
+    def test_update_profile_inactive_user(self, client, auth_headers, app):
+        """Test profile update is refused for a deactivated user"""
+        user = User.query.filter_by(email='test@example.com').first()
+        user.is_active = False
+        db.session.commit()
+        
+        response = client.put('/api/client/dashboard/profile', headers=auth_headers, json={'firstName': 'Blocked'})
+        
+        assert response.status_code == 401
+        db.session.expire_all()
+        assert User.query.filter_by(email='test@example.com').first().first_name == 'Test'
+    
+    def test_update_profile_rejects_fields_outside_whitelist(self, client, auth_headers, monkeypatch):
+        """Test profile update never writes columns outside the updatable set"""
+        from app.api.client.schemas import DashboardSchemas
+        
+        monkeypatch.setattr(
+            DashboardSchemas, 'validate_profile_update',
+            staticmethod(lambda data: (True, None, {'first_name': 'Sneaky', 'role': UserRole.ADMIN}))
+        )
+        
+        response = client.put('/api/client/dashboard/profile', headers=auth_headers, json={'firstName': 'Sneaky'})
+        
+        assert response.status_code == 422
+        assert 'role' in json.loads(response.data)['errors']
+        db.session.expire_all()
+        user = User.query.filter_by(email='test@example.com').first()
+        assert user.role == UserRole.CUSTOMER
+        assert user.first_name == 'Test'
+    
+    def test_profile_database_error_returns_json(self, client, auth_headers, monkeypatch):
+        """Test database failures surface through the blueprint error handler"""
+        from sqlalchemy.exc import OperationalError
+        from app.api.client import profile
+        
+        def broken(user_id):
+            raise OperationalError('SELECT', {}, Exception('connection lost'))
+        
+        monkeypatch.setattr(profile, '_profile_statement', broken)
+        response = client.get('/api/client/dashboard/profile', headers=auth_headers)
+        
+        assert response.status_code == 500
+        assert json.loads(response.data)['success'] is False
+    
+    def test_update_profile_requires_json_object(self, client, auth_headers):
+        """Test profile update with a non-JSON body"""
+        response = client.put('/api/client/dashboard/profile', headers=auth_headers, data='not json')
+        
+        assert response.status_code == 400
+        assert json.loads(response.data)['success'] is False
+    
+    def test_update_profile_unexpected_error_returns_json(self, client, auth_headers):
+        """Test a non-database failure still returns the JSON error envelope"""
+        response = client.put('/api/client/dashboard/profile', headers=auth_headers, json={'firstName': None})
+        
+        assert response.status_code == 500
+        assert response.mimetype == 'application/json'
+        data = json.loads(response.data)
+        assert data['success'] is False
+        assert data['message'] == 'An unexpected error occurred'
+    
+    def test_update_profile_writes_audit_entry(self, client, auth_headers, app):
+        """Test profile update records an audit log entry"""
+        from app.models import AuditLog
+        
+        response = client.put('/api/client/dashboard/profile', headers=auth_headers, json={'firstName': 'Audited'})
+        assert response.status_code == 200
+        
+        with app.app_context():
+            user = User.query.filter_by(email='test@example.com').first()
+            log = AuditLog.query.filter_by(user_id=user.id, action='profile_updated').first()
+            assert log is not None
+            assert log.entity_id == user.id
+    
+    def test_update_profile_audit_truncates_user_agent(self, client, auth_headers, app):
+        """Test oversized User-Agent headers are cut to the audit column size"""
+        from app.models import AuditLog
+        
+        headers = dict(auth_headers, **{'User-Agent': 'x' * 2000})
+        response = client.put('/api/client/dashboard/profile', headers=headers, json={'firstName': 'Agent'})
+        assert response.status_code == 200
+        
+        log = AuditLog.query.filter_by(action='profile_updated').first()
+        assert len(log.user_agent) == 500
+    
+    def test_get_profile_dates_are_iso_formatted(self, client, auth_headers):
+        """Test profile dates keep their ISO 8601 format"""
+        client.put('/api/client/dashboard/profile', headers=auth_headers, json={'dateOfBirth': '1990-05-01'})
+        
+        response = client.get('/api/client/dashboard/profile', headers=auth_headers)
+        profile = json.loads(response.data)['data']['profile']
+        
+        assert response.mimetype == 'application/json'
+        assert profile['dateOfBirth'] == '1990-05-01'
+        assert datetime.fromisoformat(profile['createdAt'])
+        assert profile['lastLogin'] is None or datetime.fromisoformat(profile['lastLogin'])
+    
     def test_update_profile_invalid_phone(self, client, auth_headers):
         """Test profile update with invalid phone"""
         response = client.put('/api/client/dashboard/profile',
@@ -205,6 +546,29 @@ class TestSubscriptionManagement:
         assert 'silver' in data['data']['availableTiers']
         assert 'gold' in data['data']['availableTiers']
     
+    def test_get_subscriptions_tiers_keep_sorted_keys(self, client, auth_headers):
+        """Test the pre-serialized tier listing follows the sorted-keys wire format"""
+        response = client.get('/api/client/dashboard/subscriptions', headers=auth_headers)
+        
+        body = response.get_data()
+        tiers = body[body.index(b'"availableTiers"'):]
+        assert tiers.index(b'"bronze"') < tiers.index(b'"gold"') < tiers.index(b'"silver"')
+        assert tiers.index(b'"benefits"') < tiers.index(b'"currency"') < tiers.index(b'"name"')
+    
+    def test_get_subscriptions_skips_unused_user_columns(self, client, auth_headers, capture_sql):
+        """Test subscriptions only load the user columns they read"""
+        with capture_sql() as statements:
+            response = client.get('/api/client/dashboard/subscriptions', headers=auth_headers)
+        
+        assert response.status_code == 200
+        data = json.loads(response.data)['data']['currentSubscription']
+        assert data['tier'] == 'none'
+        assert data['bookingsUsed'] == 0
+        user_selects = [statement for statement in statements if 'FROM users' in statement]
+        assert user_selects
+        assert all('frequent_flyer_numbers' not in statement for statement in user_selects)
+        assert all('password_hash' not in statement for statement in user_selects)
+    
     def test_upgrade_subscription_invalid_tier(self, client, auth_headers):
         """Test subscription upgrade with invalid tier"""
         response = client.post('/api/client/dashboard/subscriptions/upgrade',
@@ -217,6 +581,25 @@ class TestSubscriptionManagement:
         assert response.status_code == 422
         data = json.loads(response.data)
         assert 'tier' in data['errors']
+    
+    def test_subscription_side_effect_tasks(self, app, sample_user):
+        """Test the upgrade side-effect tasks record the notification and audit entry"""
+        from app.models import AuditLog
+        from app.tasks.subscriptions import (
+            send_subscription_email,
+            create_subscription_notification,
+            audit_subscription_upgrade
+        )
+        
+        user = User.query.filter_by(email='test@example.com').first()
+        send_subscription_email(user.id, 'silver')
+        create_subscription_notification(user.id, 'silver')
+        audit_subscription_upgrade(user.id, 'payment-id', 'silver', ip_address='127.0.0.1')
+        
+        assert Notification.query.filter_by(user_id=user.id, type='subscription_upgraded').count() == 1
+        audit = AuditLog.query.filter_by(user_id=user.id, action='subscription_upgraded').one()
+        assert audit.entity_id == 'payment-id'
+        assert audit.ip_address == '127.0.0.1'
 
 
 class TestBookingsManagement:
@@ -233,6 +616,45 @@ class TestBookingsManagement:
         assert 'pagination' in data['data']
         assert len(data['data']['bookings']) >= 1
     
+    def test_get_bookings_latest_payment_status_without_n_plus_one(self, client, auth_headers, capture_sql):
+        """Test each booking reports its newest payment's status from one batched lookup"""
+        user_id = User.query.filter_by(email='test@example.com').first().id
+        now = datetime.now(timezone.utc)
+        for index in range(5):
+            booking = Booking(
+                user_id=user_id,
+                booking_reference=f'TGT-LIST{index}',
+                booking_type='flight',
+                status=BookingStatus.CONFIRMED,
+                num_adults=2,
+                num_children=1,
+                num_infants=0,
+                base_price=Decimal('100.00'),
+                service_fee=Decimal('10.00'),
+                total_price=Decimal('110.00')
+            )
+            db.session.add(booking)
+            db.session.flush()
+            for offset, status in ((2, PaymentStatus.FAILED), (1, PaymentStatus.PAID)):
+                db.session.add(Payment(
+                    payment_reference=f'PAY-LIST{index}-{offset}',
+                    booking_id=booking.id,
+                    user_id=user_id,
+                    amount=Decimal('110.00'),
+                    status=status,
+                    created_at=now - timedelta(minutes=offset)
+                ))
+        db.session.commit()
+        
+        with capture_sql() as statements:
+            response = client.get('/api/client/dashboard/bookings?perPage=10', headers=auth_headers)
+        
+        bookings = json.loads(response.data)['data']['bookings']
+        assert len(bookings) == 5
+        assert {booking['paymentStatus'] for booking in bookings} == {'paid'}
+        assert {booking['passengerCount'] for booking in bookings} == {3}
+        assert len(statements) <= 2
+    
     def test_get_bookings_with_filters(self, client, auth_headers, sample_booking):
         """Test bookings retrieval with filters"""
         response = client.get('/api/client/dashboard/bookings?status=confirmed&type=flight',
@@ -267,6 +689,42 @@ class TestBookingsManagement:
         assert 'passengers' in data['data']['booking']
         assert 'payments' in data['data']['booking']
     
+    def test_get_booking_details_includes_children(self, client, auth_headers):
+        """Test booking details carry passengers, payments, paid timeline and updates"""
+        from app.models import Passenger
+        
+        user_id = User.query.filter_by(email='test@example.com').first().id
+        booking = Booking(
+            user_id=user_id,
+            booking_reference='TGT-DETAIL1',
+            booking_type='flight',
+            status=BookingStatus.CONFIRMED,
+            base_price=Decimal('100.00'),
+            service_fee=Decimal('10.00'),
+            total_price=Decimal('110.00')
+        )
+        db.session.add(booking)
+        db.session.flush()
+        paid_at = datetime(2024, 3, 4, 10, 0)
+        db.session.add_all([
+            Passenger(booking_id=booking.id, first_name='Ada', last_name='User',
+                      date_of_birth=datetime(1990, 1, 1).date(), passenger_type='adult'),
+            Payment(payment_reference='PAY-DETAIL1', booking_id=booking.id, user_id=user_id,
+                    amount=Decimal('110.00'), status=PaymentStatus.PAID, paid_at=paid_at),
+            Notification(user_id=user_id, booking_id=booking.id, type='booking_confirmed',
+                         title='Confirmed', message='Your booking is confirmed')
+        ])
+        db.session.commit()
+        
+        response = client.get(f'/api/client/dashboard/bookings/{booking.id}', headers=auth_headers)
+        
+        assert response.status_code == 200
+        details = json.loads(response.data)['data']['booking']
+        assert [p['firstName'] for p in details['passengers']] == ['Ada']
+        assert [p['status'] for p in details['payments']] == ['paid']
+        assert details['timeline']['paidAt'] == paid_at.isoformat()
+        assert len(details['updates']) == 1
+    
     def test_get_booking_details_not_found(self, client, auth_headers):
         """Test booking details with non-existent booking"""
         response = client.get('/api/client/dashboard/bookings/nonexistent-id',
@@ -331,6 +789,34 @@ class TestTripsManagement:
         assert data['success'] is True
 
 
+class TestFlightsOverview:
+    """Test flights overview endpoint"""
+    
+    def test_flight_summary_counts(self, client, auth_headers):
+        """Test pending quotes include both pending and requested flights"""
+        user_id = User.query.filter_by(email='test@example.com').first().id
+        statuses = [BookingStatus.PENDING, BookingStatus.REQUESTED, BookingStatus.CONFIRMED, BookingStatus.CANCELLED]
+        for i, status in enumerate(statuses):
+            db.session.add(Booking(
+                user_id=user_id,
+                booking_reference=f'TGT-FLT{i:03d}',
+                booking_type='flight',
+                status=status,
+                base_price=Decimal('100.00'),
+                service_fee=Decimal('10.00'),
+                total_price=Decimal('110.00')
+            ))
+        db.session.commit()
+        
+        response = client.get('/api/client/dashboard/flights', headers=auth_headers)
+        
+        assert response.status_code == 200
+        summary = json.loads(response.data)['data']['summary']
+        assert summary['pending_quote'] == 2
+        assert summary['ticketed'] == 1
+        assert summary['cancelled'] == 1
+
+
 class TestContactForm:
     """Test contact form endpoint"""
     
@@ -415,6 +901,30 @@ class TestNotifications:
         data = json.loads(response.data)
         assert data['success'] is True
     
+    def test_get_notifications_cursor_pagination(self, client, auth_headers):
+        """Test following nextCursor walks every notification exactly once"""
+        user_id = User.query.filter_by(email='test@example.com').first().id
+        for i in range(5):
+            db.session.add(Notification(
+                user_id=user_id,
+                type='test',
+                title=f'Notification {i}',
+                message='Test message'
+            ))
+        db.session.commit()
+        
+        titles = []
+        url = '/api/client/dashboard/notifications?perPage=2'
+        while url:
+            response = client.get(url, headers=auth_headers)
+            assert response.status_code == 200
+            data = json.loads(response.data)['data']
+            titles.extend(n['title'] for n in data['notifications'])
+            next_cursor = data['pagination']['nextCursor']
+            url = f'/api/client/dashboard/notifications?perPage=2&cursor={next_cursor}' if next_cursor else None
+        
+        assert sorted(titles) == [f'Notification {i}' for i in range(5)]
+    
     def test_mark_notification_read(self, client, auth_headers, app, sample_user):
         """Test marking notification as read"""
         # Create a test notification
@@ -0,0 +1,32 @@
+from flask import Flask
+
+from app import configure_engine_options
+
+
+def _app(uri, **config):
+    app = Flask(__name__)
+    app.config.update(SQLALCHEMY_DATABASE_URI=uri, **config)
+    configure_engine_options(app)
+    return app
+
+
+def test_server_database_gets_bounded_pool_with_pre_ping():
+    app = _app('postgresql://thrive@localhost/thrive', DB_POOL_SIZE=4)
+    options = app.config['SQLALCHEMY_ENGINE_OPTIONS']
+    
+    assert options['pool_size'] == 4
+    assert options['max_overflow'] == 20
+    assert options['pool_pre_ping'] is True
+    assert options['pool_recycle'] == 1800
+
+
+def test_explicit_engine_options_win():
+    app = _app('postgresql://thrive@localhost/thrive', SQLALCHEMY_ENGINE_OPTIONS={'pool_size': 2})
+    
+    assert app.config['SQLALCHEMY_ENGINE_OPTIONS']['pool_size'] == 2
+
+
+def test_sqlite_keeps_default_pool():
+    app = _app('sqlite:///:memory:')
+    
+    assert 'SQLALCHEMY_ENGINE_OPTIONS' not in app.config
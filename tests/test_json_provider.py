@@ -0,0 +1,29 @@
+import json
+from datetime import datetime, date
+from decimal import Decimal
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from app.utils.json_provider import ORJSONProvider
+
+
+def test_orjson_provider_matches_default_format(app):
+    payload = {
+        'success': True,
+        'data': {
+            'payments': [{'amount': 12.5, 'created_at': '2024-01-02T18:30:00'}],
+            'created_at': datetime(2024, 1, 2, 18, 30),
+            'available_from': date(2024, 1, 2),
+            'price': Decimal('19.99')
+        },
+        'message': 'ok'
+    }
+    
+    with app.app_context():
+        assert isinstance(app.json, ORJSONProvider)
+        body = app.json.response(payload).get_data()
+    
+    expected = DefaultJSONProvider(Flask(__name__)).dumps(payload)
+    assert json.loads(body) == json.loads(expected)
+    assert body.index(b'"data"') < body.index(b'"message"') < body.index(b'"success"')
@@ -96,3 +96,122 @@ class TestPackages:
              pass
         else:
              assert response.status_code == 501
+
+    def test_explore_packages_cache_cleared_on_package_write(self, app, client, db, sample_package, auth_header):
+        app.config['RESPONSE_CACHE_ENABLED'] = True
+        headers, _ = auth_header
+        
+        response = client.get('/api/client/dashboard/packages/explore?search=paris', headers=headers)
+        assert [p['name'] for p in json.loads(response.data)['data']['all_packages']] == ['Test Adventure']
+        
+        sample_package.name = 'Renamed Adventure'
+        db.session.commit()
+        
+        response = client.get('/api/client/dashboard/packages/explore?search=PARIS', headers=headers)
+        assert [p['name'] for p in json.loads(response.data)['data']['all_packages']] == ['Renamed Adventure']
+    
+    def test_explore_packages_default_served_from_cache(self, app, client, db, sample_package, auth_header, capture_sql):
+        app.config['RESPONSE_CACHE_ENABLED'] = True
+        headers, _ = auth_header
+        
+        first = client.get('/api/client/dashboard/packages/explore', headers=headers)
+        
+        with capture_sql() as statements:
+            second = client.get('/api/client/dashboard/packages/explore', headers=headers)
+        
+        assert second.status_code == 200
+        assert json.loads(second.data) == json.loads(first.data)
+        assert statements == []
+    
+    def test_explore_featured_cache_cleared_on_package_write(self, app, client, db, sample_package, auth_header):
+        app.config['RESPONSE_CACHE_ENABLED'] = True
+        headers, _ = auth_header
+        sample_package.is_featured = False
+        db.session.commit()
+        
+        response = client.get('/api/client/dashboard/packages/explore', headers=headers)
+        assert json.loads(response.data)['data']['featured'] == []
+        
+        sample_package.is_featured = True
+        db.session.commit()
+        
+        response = client.get('/api/client/dashboard/packages/explore?search=paris', headers=headers)
+        assert [p['name'] for p in json.loads(response.data)['data']['featured']] == ['Test Adventure']
+    
+    def test_my_packages_lists_active_favorites(self, client, db, sample_package, auth_header):
+        headers, user = auth_header
+        inactive = Package(
+            name="Retired Trip",
+            slug="retired-trip",
+            destination_city="Rome",
+            destination_country="Italy",
+            duration_days=3,
+            duration_nights=2,
+            starting_price=500.00,
+            price_per_person=500.00,
+            is_active=False
+        )
+        db.session.add(inactive)
+        user.favorite_packages.append(sample_package)
+        user.favorite_packages.append(inactive)
+        db.session.commit()
+        
+        response = client.get('/api/client/dashboard/packages/my-packages', headers=headers)
+        assert response.status_code == 200
+        data = json.loads(response.data)['data']
+        assert [p['name'] for p in data['saved']] == ['Test Adventure']
+    
+    def test_my_packages_includes_agent_name(self, client, db, sample_package, auth_header):
+        from decimal import Decimal
+        from app.models import Booking
+        from app.models.enums import BookingStatus
+        headers, user = auth_header
+        agent = User(
+            email="agent@example.com",
+            password_hash="hash",
+            first_name="Ada",
+            last_name="Agent",
+            role=UserRole.ADMIN,
+            is_active=True
+        )
+        db.session.add(agent)
+        db.session.flush()
+        db.session.add(Booking(
+            user_id=user.id,
+            booking_type='package',
+            status=BookingStatus.CONFIRMED,
+            package_id=sample_package.id,
+            assigned_agent_id=agent.id,
+            base_price=Decimal('1000.00'),
+            service_fee=Decimal('0.00'),
+            total_price=Decimal('1000.00')
+        ))
+        db.session.commit()
+        
+        response = client.get('/api/client/dashboard/packages/my-packages', headers=headers)
+        assert response.status_code == 200
+        booked = json.loads(response.data)['data']['booked']
+        assert booked[0]['agent']['name'] == 'Ada Agent'
+    
+    def test_get_favorites_lists_active_only(self, client, db, sample_package, auth_header):
+        headers, user = auth_header
+        inactive = Package(
+            name="Retired Trip",
+            slug="retired-trip",
+            destination_city="Rome",
+            destination_country="Italy",
+            duration_days=3,
+            duration_nights=2,
+            starting_price=500.00,
+            price_per_person=500.00,
+            is_active=False
+        )
+        db.session.add(inactive)
+        user.favorite_packages.append(sample_package)
+        user.favorite_packages.append(inactive)
+        db.session.commit()
+        db.session.expire_all()
+        
+        response = client.get('/api/packages/favorites', headers=headers)
+        assert response.status_code == 200
+        assert [p['name'] for p in json.loads(response.data)['data']] == ['Test Adventure']
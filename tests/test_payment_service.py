@@ -65,3 +65,13 @@ def test_confirm_payment_mismatch(payment_service):
             payment_service.confirm_payment("pi_123", 100.00, "USD")
         
         assert "Amount mismatch" in str(excinfo.value)
+
+def test_stripe_client_configured_from_app_config(app):
+    import stripe
+    from app.services.payment import configure_stripe_client
+    
+    configure_stripe_client({'STRIPE_HTTP_TIMEOUT': 3, 'STRIPE_MAX_NETWORK_RETRIES': 1})
+    
+    assert isinstance(stripe.default_http_client, stripe.RequestsClient)
+    assert stripe.default_http_client._timeout == 3
+    assert stripe.max_network_retries == 1
@@ -38,7 +38,8 @@ def auth_header(app, seed_data):
     user_id, _ = seed_data
     from flask_jwt_extended import create_access_token
     with app.app_context():
-        token = create_access_token(identity=user_id)
+        user = User.query.get(user_id)
+        token = create_access_token(identity=user_id, additional_claims=user.get_token_claims())
         return {'Authorization': f'Bearer {token}'}
 
 def test_create_payment_intent(client, seed_data, auth_header):
@@ -76,3 +77,225 @@ def test_create_payment_intent_amount_mismatch(client, seed_data, auth_header):
     assert response.status_code == 400
     data = response.get_json()
     assert data['error'] == 'AMOUNT_MISMATCH'
+
+def test_booking_amount_paid_tracks_payment_status(app, db, seed_data):
+    from decimal import Decimal
+    from app.models.payment import Payment
+    from app.models.enums import PaymentStatus
+    user_id, booking_id = seed_data
+    
+    payment = Payment(booking_id=booking_id, user_id=user_id, amount=Decimal('60.00'), status=PaymentStatus.PENDING)
+    db.session.add(payment)
+    db.session.commit()
+    assert db.session.get(Booking, booking_id).amount_paid == Decimal('0.00')
+    
+    payment.status = PaymentStatus.PAID
+    db.session.commit()
+    assert db.session.get(Booking, booking_id).amount_paid == Decimal('60.00')
+    
+    payment.status = PaymentStatus.REFUNDED
+    db.session.commit()
+    assert db.session.get(Booking, booking_id).amount_paid == Decimal('0.00')
+
+def test_get_payments_cursor_pagination(client, db, seed_data, auth_header):
+    from app.models.payment import Payment
+    user_id, booking_id = seed_data
+    
+    for i in range(5):
+        db.session.add(Payment(booking_id=booking_id, user_id=user_id, amount=10 + i))
+    db.session.commit()
+    
+    references = []
+    url = '/api/client/dashboard/payments?perPage=2'
+    while url:
+        response = client.get(url, headers=auth_header)
+        assert response.status_code == 200
+        data = response.get_json()['data']
+        references.extend(p['payment_reference'] for p in data['payments'])
+        next_cursor = data['pagination']['nextCursor']
+        url = f'/api/client/dashboard/payments?perPage=2&cursor={next_cursor}' if next_cursor else None
+    
+    assert len(references) == 5
+    assert len(set(references)) == 5
+
+def test_get_payments_rejects_inactive_token(app, client, seed_data):
+    from flask_jwt_extended import create_access_token
+    user_id, _ = seed_data
+    with app.app_context():
+        claims = User.query.get(user_id).get_token_claims()
+        claims['act'] = False
+        token = create_access_token(identity=user_id, additional_claims=claims)
+    
+    response = client.get('/api/client/dashboard/payments', headers={'Authorization': f'Bearer {token}'})
+    assert response.status_code == 401
+
+def _succeeded_intent(booking_id, **overrides):
+    fields = dict(status='succeeded', latest_charge='ch_123', metadata={'booking_id': booking_id},
+                  amount_received=10000, currency='usd')
+    fields.update(overrides)
+    intent = MagicMock(**fields)
+    intent.charges.data = []
+    return intent
+
+def test_confirm_payment_records_payment_and_notifies(client, db, seed_data):
+    from app.models.payment import Payment
+    from app.models.notification import Notification
+    user_id, booking_id = seed_data
+    booking = db.session.get(Booking, booking_id)
+    booking.status = BookingStatus.CONFIRMED
+    db.session.commit()
+    
+    intent = _succeeded_intent(booking_id)
+    with patch('app.api.client.payments.stripe.PaymentIntent.retrieve', return_value=intent), \
+            patch('app.tasks.payments.EmailService.send_email'):
+        response = client.post('/api/client/dashboard/payments/confirm', json={
+            'paymentIntentId': 'pi_confirm',
+            'bookingReference': 'REF123'
+        })
+    
+    assert response.status_code == 200
+    payment = Payment.query.filter_by(stripe_payment_intent_id='pi_confirm').one()
+    assert payment.booking_id == booking_id
+    assert Notification.query.filter_by(user_id=user_id, booking_id=booking_id).count() == 1
+
+def test_confirm_payment_is_idempotent_per_intent(client, db, seed_data):
+    from app.models.payment import Payment
+    _, booking_id = seed_data
+    booking = db.session.get(Booking, booking_id)
+    booking.status = BookingStatus.CONFIRMED
+    db.session.commit()
+    
+    intent = _succeeded_intent(booking_id)
+    payload = {'paymentIntentId': 'pi_repeat', 'bookingReference': 'REF123'}
+    with patch('app.api.client.payments.stripe.PaymentIntent.retrieve', return_value=intent) as retrieve, \
+            patch('app.tasks.payments.EmailService.send_email'):
+        first = client.post('/api/client/dashboard/payments/confirm', json=payload)
+        second = client.post('/api/client/dashboard/payments/confirm', json=payload)
+    
+    assert retrieve.call_count == 1
+    assert first.status_code == 200
+    assert second.status_code == 200
+    assert second.get_json()['message'] == 'Payment already confirmed'
+    assert Payment.query.filter_by(stripe_payment_intent_id='pi_repeat').count() == 1
+
+@pytest.mark.parametrize('overrides', [
+    {'metadata': {}},
+    {'metadata': {'booking_id': 'another-booking'}},
+    {'amount_received': 100},
+    {'currency': 'eur'},
+])
+def test_confirm_payment_rejects_mismatched_intent(client, db, seed_data, overrides):
+    from app.models.payment import Payment
+    _, booking_id = seed_data
+    booking = db.session.get(Booking, booking_id)
+    booking.status = BookingStatus.CONFIRMED
+    db.session.commit()
+    
+    intent = _succeeded_intent(booking_id, **overrides)
+    with patch('app.api.client.payments.stripe.PaymentIntent.retrieve', return_value=intent):
+        response = client.post('/api/client/dashboard/payments/confirm', json={
+            'paymentIntentId': 'pi_mismatch',
+            'bookingReference': 'REF123'
+        })
+    
+    assert response.status_code == 400
+    assert Payment.query.filter_by(booking_id=booking_id).count() == 0
+
+def test_confirm_payment_rejects_intent_recorded_for_another_booking(client, db, seed_data):
+    from app.models.payment import Payment
+    user_id, booking_id = seed_data
+    booking = db.session.get(Booking, booking_id)
+    booking.status = BookingStatus.CONFIRMED
+    other = Booking(user_id=user_id, booking_reference='REF456', booking_type='flight',
+                    base_price=90.00, service_fee=10.00, total_price=100.00,
+                    status=BookingStatus.CONFIRMED, origin='JFK', destination='LAX')
+    db.session.add(other)
+    db.session.commit()
+    
+    intent = _succeeded_intent(booking_id)
+    with patch('app.api.client.payments.stripe.PaymentIntent.retrieve', return_value=intent), \
+            patch('app.tasks.payments.EmailService.send_email'):
+        first = client.post('/api/client/dashboard/payments/confirm', json={
+            'paymentIntentId': 'pi_shared',
+            'bookingReference': 'REF123'
+        })
+        second = client.post('/api/client/dashboard/payments/confirm', json={
+            'paymentIntentId': 'pi_shared',
+            'bookingReference': 'REF456'
+        })
+    
+    assert first.status_code == 200
+    assert second.status_code == 400
+    assert second.get_json()['message'] != 'Payment already confirmed'
+    assert Payment.query.filter_by(booking_id=other.id).count() == 0
+
+def test_confirm_payment_requires_confirmed_booking(client, db, seed_data):
+    from app.models.payment import Payment
+    _, booking_id = seed_data
+    booking = db.session.get(Booking, booking_id)
+    booking.status = BookingStatus.PENDING
+    db.session.commit()
+    
+    with patch('app.api.client.payments.stripe.PaymentIntent.retrieve') as retrieve:
+        response = client.post('/api/client/dashboard/payments/confirm', json={
+            'paymentIntentId': 'pi_pending',
+            'bookingReference': 'REF123'
+        })
+    
+    assert response.status_code == 400
+    assert retrieve.call_count == 0
+    assert Payment.query.filter_by(booking_id=booking_id).count() == 0
+
+def test_booking_total_price_cents_follows_total_price(db, seed_data):
+    from decimal import Decimal
+    _, booking_id = seed_data
+    booking = db.session.get(Booking, booking_id)
+    assert booking.total_price_cents == 10000
+    
+    booking.total_price = Decimal('123.45')
+    db.session.commit()
+    assert booking.total_price_cents == 12345
+
+def test_sync_schema_adds_cents_column_and_intent_index(db, seed_data, runner):
+    from decimal import Decimal
+    from sqlalchemy import inspect, text
+    from app.models.payment import Payment
+    from app.models.enums import PaymentStatus
+    user_id, booking_id = seed_data
+    db.session.add(Payment(booking_id=booking_id, user_id=user_id, amount=Decimal('40.00'), status=PaymentStatus.PAID))
+    db.session.commit()
+    db.session.execute(text('DROP INDEX ux_payments_stripe_intent'))
+    db.session.execute(text('ALTER TABLE bookings DROP COLUMN total_price_cents'))
+    db.session.execute(text('ALTER TABLE bookings DROP COLUMN amount_paid'))
+    db.session.commit()
+    
+    result = runner.invoke(args=['db-manage', 'sync-schema'])
+    
+    assert result.exit_code == 0
+    assert 'bookings.amount_paid' in result.output
+    assert 'bookings.total_price_cents' in result.output
+    assert 'ux_payments_stripe_intent' in result.output
+    inspector = inspect(db.engine)
+    assert 'ux_payments_stripe_intent' in {index['name'] for index in inspector.get_indexes('payments')}
+    db.session.expire_all()
+    assert db.session.get(Booking, booking_id).total_price_cents == 10000
+    assert db.session.get(Booking, booking_id).amount_paid == Decimal('40.00')
+    
+    result = runner.invoke(args=['db-manage', 'sync-schema'])
+    assert 'already up to date' in result.output
+
+def test_get_payments_date_filters(client, db, seed_data, auth_header):
+    from datetime import datetime
+    from app.models.payment import Payment
+    user_id, booking_id = seed_data
+    for day in (1, 2, 3):
+        db.session.add(Payment(booking_id=booking_id, user_id=user_id, amount=day,
+                               created_at=datetime(2024, 1, day, 18, 30)))
+    db.session.commit()
+    
+    response = client.get('/api/client/dashboard/payments?fromDate=2024-01-02&toDate=2024-01-02', headers=auth_header)
+    assert response.status_code == 200
+    assert [p['amount'] for p in response.get_json()['data']['payments']] == [2.0]
+    
+    response = client.get('/api/client/dashboard/payments?fromDate=01/02/2024', headers=auth_header)
+    assert response.status_code == 422